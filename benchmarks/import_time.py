@@ -0,0 +1,57 @@
+"""Benchmark the cold import time of hlsxarr.
+
+Every statement is timed in a fresh interpreter so that nothing is cached
+between runs. Usage:
+
+    python benchmarks/import_time.py [--runs 10]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import hlsxarr": "import hlsxarr",
+    "from hlsxarr import HLSProcessor": "from hlsxarr import HLSProcessor",
+    "search stage": "import hlsxarr.process.search",
+    "read stage": "import hlsxarr.process.read",
+    "reproject stage": "import hlsxarr.process.reproject",
+    "merge stage": "import hlsxarr.process.merge",
+}
+
+TIMER = (
+    "import time; _start = time.perf_counter(); {statement}; "
+    "print(time.perf_counter() - _start)"
+)
+
+
+def _time_import(statement: str, runs: int) -> list:
+    """Time an import statement in fresh interpreters."""
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        timings.append(float(output.strip()))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per statement")
+    args = parser.parse_args()
+
+    for name, statement in STATEMENTS.items():
+        timings = _time_import(statement, args.runs)
+        print(
+            f"{name:<36} median {statistics.median(timings) * 1000:8.1f} ms"
+            f"   min {min(timings) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
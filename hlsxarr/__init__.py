@@ -1,4 +1,40 @@
-from .hls import HLSProcessor
-from .roi import RoiPolygon
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["HLSProcessor", "RoiPolygon"]
+if TYPE_CHECKING:
+    from .hls import HLSProcessor
+    from .roi import RoiPolygon
+    from .process.plan import ProcessPlan
+    from .budget import DownloadBudget
+    from .hooks import ProcessHooks, ChromeTracer
+
+__all__ = [
+    "HLSProcessor",
+    "RoiPolygon",
+    "ProcessPlan",
+    "DownloadBudget",
+    "ProcessHooks",
+    "ChromeTracer",
+]
+
+# Public names and the modules they are loaded from on first access, so that
+# `import hlsxarr` does not pull in xarray, rasterio, pyproj and friends.
+_LAZY_IMPORTS = {
+    "HLSProcessor": ".hls",
+    "RoiPolygon": ".roi",
+    "ProcessPlan": ".process.plan",
+    "DownloadBudget": ".budget",
+    "ProcessHooks": ".hooks",
+    "ChromeTracer": ".hooks",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
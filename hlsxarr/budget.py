@@ -0,0 +1,48 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class DownloadBudget:
+    """Download concurrency budget shared across processing jobs.
+
+    At most `max_downloads` files are downloaded at the same time by all the jobs
+    holding the budget, whatever the number of workers of each job.
+
+    Args:
+        max_downloads (int): Maximum number of concurrent downloads.
+    """
+
+    def __init__(self, max_downloads: int):
+        if max_downloads < 1:
+            raise ValueError("max_downloads should be at least 1")
+
+        self._max_downloads = max_downloads
+        self._semaphore = threading.BoundedSemaphore(max_downloads)
+        self._lock = threading.Lock()
+        self._files = 0
+        self._bytes = 0
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the download slots."""
+        with self._semaphore:
+            yield
+
+    def record(self, n_bytes: int):
+        """Record a completed download."""
+        with self._lock:
+            self._files += 1
+            self._bytes += n_bytes
+
+    @property
+    def max_downloads(self) -> int:
+        return self._max_downloads
+
+    @property
+    def files(self) -> int:
+        return self._files
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
@@ -0,0 +1,276 @@
+"""Command-line batch runner for hlsxarr.
+
+Runs the jobs of a JSON manifest, writes every result to a NetCDF file and
+reports the throughput. The manifest lists the jobs and optional defaults that
+apply to every job:
+
+    {
+        "defaults": {
+            "collections": ["HLSS30.v2.0", "HLSL30.v2.0"],
+            "bands": ["RED", "NIR", "FMASK"],
+            "limit": 100
+        },
+        "jobs": [
+            {
+                "name": "aoi-1",
+                "roi": {"type": "Polygon", "coordinates": [...]},
+                "start_date": "2025-01-01",
+                "end_date": "2025-01-07"
+            }
+        ]
+    }
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional
+
+from .budget import DownloadBudget
+
+# Job keys passed through to HLSProcessor.process()
+JOB_KEYS = {
+    "roi",
+    "start_date",
+    "end_date",
+    "collections",
+    "bands",
+    "limit",
+    "max_area_km2",
+    "memory_budget_gb",
+    "reflectance",
+    "complevel",
+    "indices",
+    "keep_bands",
+}
+
+REQUIRED_JOB_KEYS = {"roi", "start_date", "end_date", "collections", "bands", "limit"}
+
+
+def _load_manifest(path: str) -> List[dict]:
+    """Load the jobs of a manifest with the defaults applied.
+
+    Args:
+        path (str): Path to the JSON manifest.
+
+    Returns:
+        List[dict]: The jobs.
+    """
+    with open(path) as f:
+        manifest = json.load(f)
+
+    defaults = manifest.get("defaults", {})
+    jobs = []
+    for index, job in enumerate(manifest.get("jobs", [])):
+        job = {**defaults, **job}
+        job.setdefault("name", f"job-{index}")
+
+        # GeoJSON Features are accepted as well as geometries
+        if job.get("roi", {}).get("type") == "Feature":
+            job["roi"] = job["roi"]["geometry"]
+
+        missing = REQUIRED_JOB_KEYS - set(job)
+        if missing:
+            raise ValueError(
+                f"Job {job['name']} is missing the keys: {', '.join(sorted(missing))}"
+            )
+        unknown = set(job) - JOB_KEYS - {"name", "output"}
+        if unknown:
+            raise ValueError(
+                f"Job {job['name']} has unknown keys: {', '.join(sorted(unknown))}"
+            )
+        jobs.append(job)
+
+    if not jobs:
+        raise ValueError(f"No jobs found in {path}")
+
+    return jobs
+
+
+def _run_job(
+    hls,
+    job: dict,
+    output_dir: str,
+    workers: int,
+    memory_budget_gb: Optional[float],
+    download_budget: DownloadBudget,
+    reflectance: str = "int16",
+    complevel: Optional[int] = None,
+) -> str:
+    """Run a single job and write its result to disk.
+
+    Returns:
+        str: A summary line of the job.
+    """
+    kwargs = {key: value for key, value in job.items() if key in JOB_KEYS}
+    kwargs.setdefault("memory_budget_gb", memory_budget_gb)
+    kwargs.setdefault("reflectance", reflectance)
+    kwargs.setdefault("complevel", complevel)
+
+    start = time.perf_counter()
+    ds = hls.process(
+        workers=workers,
+        download_budget=download_budget,
+        **kwargs,
+    )
+    if ds is None:
+        return f"{job['name']}: no data"
+
+    output = os.path.join(output_dir, job.get("output", f"{job['name']}.nc"))
+    ds.to_netcdf(output)
+    elapsed = time.perf_counter() - start
+
+    return (
+        f"{job['name']}: {ds.sizes['time']} time steps, "
+        f"{os.path.getsize(output) / 1e6:.1f} MB written to {output} in {elapsed:.1f} s"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="hlsxarr",
+        description="Read HLS data for the jobs of a manifest and write them to NetCDF files.",
+    )
+    parser.add_argument("manifest", help="Path to the JSON job manifest")
+    parser.add_argument(
+        "-o", "--output-dir", default=".", help="Output directory (default: .)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of jobs (ROIs) to run in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "-d",
+        "--max-downloads",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent downloads across all jobs (default: 8)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Read workers per job (default: --max-downloads)",
+    )
+    parser.add_argument(
+        "-m",
+        "--memory-budget-gb",
+        type=float,
+        default=None,
+        help="Memory budget per job in gigabytes",
+    )
+    parser.add_argument(
+        "-r",
+        "--reflectance",
+        choices=["int16", "float32"],
+        default="int16",
+        help="dtype of the spectral bands: scaled int16 with CF metadata or float32 reflectance (default: int16)",
+    )
+    parser.add_argument(
+        "-c",
+        "--complevel",
+        type=int,
+        choices=range(1, 10),
+        default=None,
+        metavar="{1-9}",
+        help="zlib compression level of the output files (default: uncompressed)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print the plan of every job",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        metavar="PATH",
+        help="Write a Chrome trace / Perfetto JSON timeline of the run to PATH",
+    )
+    parser.add_argument(
+        "--edl-token",
+        default=None,
+        help="Earthdata Login token (default: EDL_TOKEN environment variable)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.jobs < 1 or args.max_downloads < 1:
+        parser.error("--jobs and --max-downloads should be at least 1")
+
+    try:
+        jobs = _load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    from .hls import HLSProcessor
+    from .hooks import ChromeTracer
+
+    tracer = ChromeTracer() if args.trace else None
+
+    try:
+        hls = HLSProcessor(
+            edl_token=args.edl_token, hooks=[tracer] if tracer else None
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    workers = args.workers or args.max_downloads
+
+    if args.dry_run:
+        for job in jobs:
+            kwargs = {key: value for key, value in job.items() if key in JOB_KEYS}
+            kwargs.setdefault("memory_budget_gb", args.memory_budget_gb)
+            kwargs.setdefault("reflectance", args.reflectance)
+            kwargs.pop("complevel", None)
+            print(f"{job['name']}: {hls.plan(workers=workers, **kwargs)}")
+        return 0
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    download_budget = DownloadBudget(args.max_downloads)
+
+    failed = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(
+                _run_job,
+                hls,
+                job,
+                args.output_dir,
+                workers,
+                args.memory_budget_gb,
+                download_budget,
+                args.reflectance,
+                args.complevel,
+            ): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                print(future.result())
+            except Exception as e:
+                failed += 1
+                print(f"{futures[future]['name']}: failed: {e}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    if tracer is not None:
+        tracer.save(args.trace)
+
+    print(
+        f"{len(jobs) - failed}/{len(jobs)} jobs done in {elapsed:.1f} s, "
+        f"downloaded {download_budget.files} files ({download_budget.bytes / 1e6:.1f} MB), "
+        f"{download_budget.files / elapsed:.2f} files/s, "
+        f"{download_budget.bytes / 1e6 / elapsed:.2f} MB/s"
+    )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from .types import Collections, Bands
+from .types import Collections, Bands, Indices
 
 
 class AreaTooLargeError(Exception):
@@ -22,6 +22,20 @@ class InvalidBandError(Exception):
         )
 
 
+class InvalidIndexError(Exception):
+    def __init__(self, index):
+        super().__init__(
+            f"InvalidIndexError: Invalid index: {index}, valid indices are: {set(Indices.INDICES)}"
+        )
+
+
 class ProcessError(Exception):
     def __init__(self, message):
         super().__init__(f"ProcessError: {message}")
+
+
+class MemoryBudgetExceededError(Exception):
+    def __init__(self, required: float, budget: float):
+        super().__init__(
+            f"MemoryBudgetExceededError: Estimated peak memory of {required / 1e9:.2f} GB exceeds memory budget of {budget / 1e9:.2f} GB"
+        )
@@ -1,26 +1,89 @@
 import os
-from .roi import RoiPolygon
-from typing import Optional
-from .process.read import _read
-from .process.merge import _merge
-from .process.search import _search
-from .types import CollectionType, BandsType
-from .exceptions import ProcessError
-import xarray as xr
+from typing import List, Optional, TYPE_CHECKING
+from .types import CollectionType, BandsType, ReflectanceType, IndicesType
+from .exceptions import ProcessError, MemoryBudgetExceededError
+from .hooks import ProcessHooks, _stage
+
+# The processing stages and their heavy dependencies are imported when they run.
+if TYPE_CHECKING:
+    import pandas as pd
+    import xarray as xr
+    from .roi import RoiPolygon
+    from .process.plan import ProcessPlan
+    from .budget import DownloadBudget
 
 
 class HLSProcessor:
     def __init__(
         self,
         edl_token: Optional[str] = None,
+        hooks: Optional[List[ProcessHooks]] = None,
     ):
         self._edl_token = edl_token or os.getenv("EDL_TOKEN")
+        self._hooks = list(hooks or [])
 
         if not self._edl_token:
             raise ValueError(
                 "An Earthdata Login token is required to access HLS data. Set the EDL_TOKEN environment variable."
             )
 
+    def plan(
+        self,
+        roi: dict,
+        start_date: str,
+        end_date: str,
+        collections: CollectionType,
+        bands: BandsType,
+        limit: int,
+        workers: int,
+        max_area_km2: Optional[float] = None,
+        memory_budget_gb: Optional[float] = None,
+        reflectance: ReflectanceType = "int16",
+        indices: Optional[IndicesType] = None,
+        keep_bands: bool = True,
+    ) -> "ProcessPlan":
+        """Plan the processing of HLS data without reading it (dry run)
+
+        Args:
+            roi (dict): Region of interest as GeoJSON geometry dictionary
+            start_date (str): Start date for the search
+            end_date (str): End date for the search
+            collections (CollectionType): HLS collections to search
+            bands (BandsType): Bands to read
+            limit (int): Maximum number of scenes to search
+            workers (int): Number of parallel workers to use for reading data
+            max_area_km2 (Optional[float]): Maximum area in square kilometers. Defaults to None.
+            memory_budget_gb (Optional[float]): Memory budget in gigabytes. Defaults to None.
+            reflectance (ReflectanceType): The dtype of the spectral bands. Defaults to "int16".
+            indices (Optional[IndicesType]): Spectral indices to compute. Defaults to None.
+            keep_bands (bool): Whether to keep the requested bands used by the indices. Defaults to True.
+
+        Returns:
+            ProcessPlan: Estimated output size, peak memory, download volume and execution mode
+        """
+
+        from .roi import RoiPolygon
+        from .process.plan import _plan
+        from .process.indices import _split_bands
+
+        try:
+            roi_polygon = RoiPolygon(geometry=roi, max_area_km2=max_area_km2)
+            read_bands, drop_bands = _split_bands(bands, indices, keep_bands)
+            df = self._search(
+                roi_polygon, start_date, end_date, collections, read_bands, limit
+            )
+            return _plan(
+                roi=roi_polygon,
+                df=df,
+                workers=workers,
+                memory_budget_gb=memory_budget_gb,
+                reflectance=reflectance,
+                indices=indices,
+                drop_bands=drop_bands,
+            )
+        except Exception as e:
+            raise ProcessError(str(e))
+
     def process(
         self,
         roi: dict,
@@ -30,8 +93,14 @@ class HLSProcessor:
         bands: BandsType,
         limit: int,
         workers: int,
-        max_area_km2: float = 1000,
-    ) -> Optional[xr.Dataset]:
+        max_area_km2: Optional[float] = None,
+        memory_budget_gb: Optional[float] = None,
+        download_budget: Optional["DownloadBudget"] = None,
+        reflectance: ReflectanceType = "int16",
+        complevel: Optional[int] = None,
+        indices: Optional[IndicesType] = None,
+        keep_bands: bool = True,
+    ) -> Optional["xr.Dataset"]:
         """Process HLS data
 
         Args:
@@ -42,42 +111,167 @@ class HLSProcessor:
             bands (BandsType): Bands to read
             limit (int): Maximum number of scenes to search
             workers (int): Number of parallel workers to use for reading data
-            max_area_km2 (float): Maximum area in square kilometers. Defaults to 1000.
+            max_area_km2 (Optional[float]): Maximum area in square kilometers. Defaults to None.
+            memory_budget_gb (Optional[float]): Memory budget in gigabytes. When the
+                estimated peak memory exceeds it, fewer workers are used (streaming) or
+                the granules are read and merged in batches (tiled). Defaults to None.
+            download_budget (Optional[DownloadBudget]): Download concurrency budget shared
+                with other process() calls. Defaults to None.
+            reflectance (ReflectanceType): "int16" keeps the scaled spectral bands with CF
+                scale_factor and _FillValue metadata, "float32" converts them to reflectance
+                while reading. Defaults to "int16".
+            complevel (Optional[int]): zlib compression level (1-9) of the variables when
+                the dataset is written to NetCDF. Defaults to None (uncompressed).
+            indices (Optional[IndicesType]): Spectral indices (NDVI, NBR, NDWI, EVI) to
+                compute per granule as it is read. Bands needed only by the indices are
+                read but not returned. Defaults to None.
+            keep_bands (bool): Whether to keep the requested bands used by the indices.
+                Defaults to True.
 
         Returns:
-            xr.Dataset: Merged xarray dataset
+            xr.Dataset: Merged xarray dataset, or None if the search found no data.
+                Raises ProcessError when the granules found could not be read.
         """
 
+        from .roi import RoiPolygon
+        from .process.plan import _plan
+        from .process.indices import _split_bands
+
         try:
             # Create the ROI polygon
             roi_polygon = RoiPolygon(geometry=roi, max_area_km2=max_area_km2)
 
-            print("Searching HLS data...")
-            df = _search(
-                roi=roi_polygon,
-                start_date=start_date,
-                end_date=end_date,
-                collections=collections,
-                bands=bands,
-                limit=limit,
+            # Bands needed by the indices are read as well
+            read_bands, drop_bands = _split_bands(bands, indices, keep_bands)
+
+            df = self._search(
+                roi_polygon, start_date, end_date, collections, read_bands, limit
             )
-            print(f"Found {len(df)} urls")
 
             if df.empty:
                 print("No data found")
                 return
             else:
-                xr_da_list = _read(
+                plan = _plan(
                     roi=roi_polygon,
                     df=df,
                     workers=workers,
-                    edl_token=self._edl_token,
+                    memory_budget_gb=memory_budget_gb,
+                    reflectance=reflectance,
+                    indices=indices,
+                    drop_bands=drop_bands,
                 )
-                if len(xr_da_list) > 0:
-                    processes_xr_dataset = _merge(df=df, da_list=xr_da_list)
-                    return processes_xr_dataset
+                if memory_budget_gb is not None:
+                    print(plan)
+                if not plan.fits_budget:
+                    raise MemoryBudgetExceededError(
+                        plan.peak_memory_bytes, plan.memory_budget_bytes
+                    )
+
+                from .process.scale import _set_cf_encoding
+
+                read_options = dict(
+                    download_budget=download_budget,
+                    reflectance=reflectance,
+                    indices=indices,
+                    drop_bands=drop_bands,
+                    hooks=self._hooks,
+                )
+                if plan.mode == "tiled":
+                    processes_xr_dataset = self._process_batches(
+                        roi_polygon, df, plan, **read_options
+                    )
                 else:
-                    print("Processing incomplete")
-                    return
+                    processes_xr_dataset = self._process_all(
+                        roi_polygon, df, plan, **read_options
+                    )
+
+                if processes_xr_dataset is None:
+                    # Not the same as an empty search: the granules were found but
+                    # could not be read, e.g. after a credential error.
+                    raise ProcessError("Processing incomplete, no granule could be read")
+                return _set_cf_encoding(processes_xr_dataset, reflectance, complevel)
+        except ProcessError:
+            raise
         except Exception as e:
             raise ProcessError(str(e))
+
+    def _search(
+        self,
+        roi_polygon: "RoiPolygon",
+        start_date: str,
+        end_date: str,
+        collections: CollectionType,
+        bands: BandsType,
+        limit: int,
+    ) -> "pd.DataFrame":
+        """Helper function to search HLS data for the ROI."""
+        from .process.search import _search
+
+        print("Searching HLS data...")
+        with _stage(self._hooks, "search", start_date=start_date, end_date=end_date):
+            df = _search(
+                roi=roi_polygon,
+                start_date=start_date,
+                end_date=end_date,
+                collections=collections,
+                bands=bands,
+                limit=limit,
+            )
+        print(f"Found {len(df)} urls")
+        return df
+
+    def _process_all(
+        self,
+        roi_polygon: "RoiPolygon",
+        df: "pd.DataFrame",
+        plan: "ProcessPlan",
+        **read_options,
+    ) -> Optional["xr.Dataset"]:
+        """Helper function to read and merge all the granules at once."""
+        from .process.read import _read
+        from .process.merge import _merge
+
+        xr_ds_list = _read(
+            roi=roi_polygon,
+            df=df,
+            workers=plan.workers,
+            edl_token=self._edl_token,
+            **read_options,
+        )
+        if len(xr_ds_list) == 0:
+            return
+        with _stage(self._hooks, "merge", granules=len(xr_ds_list)):
+            return _merge(df=df, ds_list=xr_ds_list)
+
+    def _process_batches(
+        self,
+        roi_polygon: "RoiPolygon",
+        df: "pd.DataFrame",
+        plan: "ProcessPlan",
+        **read_options,
+    ) -> Optional["xr.Dataset"]:
+        """Helper function to read and merge the granules batch by batch."""
+        import xarray as xr
+        from .process.read import _read
+        from .process.merge import _merge
+        from .process.plan import _plan_batches
+
+        batch_ds_list = []
+        for batch_df in _plan_batches(df, plan.batch_size):
+            xr_ds_list = _read(
+                roi=roi_polygon,
+                df=batch_df,
+                workers=plan.workers,
+                edl_token=self._edl_token,
+                **read_options,
+            )
+            if len(xr_ds_list) == 0:
+                return
+            # Merge against the full DataFrame so that every batch has the same variables
+            with _stage(self._hooks, "merge", granules=len(xr_ds_list)):
+                batch_ds_list.append(_merge(df=df, ds_list=xr_ds_list))
+            del xr_ds_list
+
+        with _stage(self._hooks, "merge", batches=len(batch_ds_list)):
+            return xr.concat(batch_ds_list, dim="time").sortby("time")
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Sequence
+
+# Stages of the processing pipeline reported to the hooks.
+# search: STAC search, queue: wait for a slot of the download budget, fetch:
+# download attempt of a band file, or ranged read and decode of the ROI blocks
+# of a remote band file, retry: backoff before the next attempt, decode: read
+# of the ROI window of a downloaded file, reproject: reprojection to the ROI CRS,
+# indices: spectral indices of a granule, merge: merge of the granules into the
+# output dataset.
+STAGES = (
+    "search",
+    "queue",
+    "fetch",
+    "retry",
+    "decode",
+    "reproject",
+    "indices",
+    "merge",
+)
+
+
+class ProcessHooks:
+    """Base class of the processing hooks.
+
+    Subclasses override `pre_stage` and `post_stage`, which are called before and
+    after every stage, from the thread running it. `info` describes the stage
+    (band, url, granule, ...) and is the same dictionary for both calls.
+    """
+
+    def pre_stage(self, stage: str, info: dict):
+        pass
+
+    def post_stage(self, stage: str, info: dict):
+        pass
+
+
+class ChromeTracer(ProcessHooks):
+    """Hook recording the stages as a Chrome trace / Perfetto JSON timeline.
+
+    Every stage becomes a complete event on the timeline of the thread that ran
+    it, so waits for a download slot (queue), downloads (fetch) and CPU work
+    (decode, reproject, ...) of the read workers can be told apart.
+
+    Example:
+        tracer = ChromeTracer()
+        hls = HLSProcessor(hooks=[tracer])
+        hls.process(...)
+        tracer.save("trace.json")  # open in https://ui.perfetto.dev
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._events: List[dict] = []
+        self._threads = {}
+        self._pid = os.getpid()
+
+    def pre_stage(self, stage: str, info: dict):
+        starts = getattr(self._local, "starts", None)
+        if starts is None:
+            starts = self._local.starts = []
+        starts.append(time.perf_counter_ns())
+
+    def post_stage(self, stage: str, info: dict):
+        end = time.perf_counter_ns()
+        start = self._local.starts.pop()
+        thread = threading.current_thread()
+        event = {
+            "name": stage,
+            "cat": stage,
+            "ph": "X",
+            "ts": start / 1e3,
+            "dur": (end - start) / 1e3,
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": {key: str(value) for key, value in info.items()},
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads[thread.ident] = thread.name
+
+    @property
+    def events(self) -> List[dict]:
+        """The recorded trace events."""
+        with self._lock:
+            return list(self._events)
+
+    def to_dict(self) -> dict:
+        """Get the trace in the Chrome trace event format."""
+        with self._lock:
+            metadata = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._threads.items()
+            ]
+            return {"traceEvents": metadata + self._events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str):
+        """Write the trace to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+
+@contextmanager
+def _stage(hooks: Sequence[ProcessHooks], stage: str, **info) -> Iterator[dict]:
+    """Run the hooks around a stage of the pipeline."""
+    if not hooks:
+        yield info
+        return
+
+    for hook in hooks:
+        hook.pre_stage(stage, info)
+    try:
+        yield info
+    finally:
+        for hook in hooks:
+            hook.post_stage(stage, info)
@@ -1,7 +1,41 @@
-from .merge import _merge
-from .read import _read
-from .stac2xrda import _stac2xrda
-from .reproject import _reproject_xr_da
-from .search import _search
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["_merge", "_read", "_stac2xrda", "_reproject_xr_da", "_search"]
+if TYPE_CHECKING:
+    from .merge import _merge
+    from .read import _read
+    from .stac2xrda import _stac2xrda
+    from .reproject import _reproject_xr_da
+    from .search import _search
+    from .plan import _plan, _plan_batches, ProcessPlan
+
+__all__ = [
+    "_merge",
+    "_read",
+    "_stac2xrda",
+    "_reproject_xr_da",
+    "_search",
+    "_plan",
+    "_plan_batches",
+    "ProcessPlan",
+]
+
+# Every stage is imported on first access so that only the dependencies of the
+# stages that actually run are loaded.
+_LAZY_IMPORTS = {
+    "_merge": ".merge",
+    "_read": ".read",
+    "_stac2xrda": ".stac2xrda",
+    "_reproject_xr_da": ".reproject",
+    "_search": ".search",
+    "_plan": ".plan",
+    "_plan_batches": ".plan",
+    "ProcessPlan": ".plan",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
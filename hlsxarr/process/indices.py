@@ -0,0 +1,98 @@
+import numpy as np
+import xarray as xr
+from typing import List, Optional, Tuple
+from ..types import Indices, IndicesType
+from ..exceptions import InvalidIndexError
+from .scale import _to_reflectance
+
+
+def _normalized_difference(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a - b) / (a + b)
+
+
+# Spectral index formulas on surface reflectance
+INDEX_FORMULAS = {
+    "NDVI": lambda bands: _normalized_difference(bands["NIR"], bands["RED"]),
+    "NBR": lambda bands: _normalized_difference(bands["NIR"], bands["SWIR2"]),
+    "NDWI": lambda bands: _normalized_difference(bands["GREEN"], bands["NIR"]),
+    "EVI": lambda bands: 2.5
+    * (bands["NIR"] - bands["RED"])
+    / (bands["NIR"] + 6 * bands["RED"] - 7.5 * bands["BLUE"] + 1),
+}
+
+
+def _index_bands(indices: IndicesType) -> List[str]:
+    """Get the bands needed to compute the spectral indices.
+
+    Args:
+        indices (IndicesType): The spectral indices.
+
+    Returns:
+        List[str]: The band names.
+    """
+    if not isinstance(indices, list):
+        raise ValueError("indices should be a list")
+
+    bands = []
+    for index in indices:
+        if not Indices.is_valid_index(index):
+            raise InvalidIndexError(index)
+        for band in Indices.INDICES[index]:
+            if band not in bands:
+                bands.append(band)
+
+    return bands
+
+
+def _compute_indices(ds: xr.Dataset, indices: IndicesType) -> xr.Dataset:
+    """Add float32 spectral indices to a granule Dataset.
+
+    Pixels where any input band is nodata are set to NaN.
+
+    Args:
+        ds (xr.Dataset): The granule Dataset with the input bands.
+        indices (IndicesType): The spectral indices.
+
+    Returns:
+        xr.Dataset: The Dataset with one variable per index.
+    """
+    reflectance = {}
+    for band in _index_bands(indices):
+        da = ds[band]
+        reflectance[band] = (
+            da.values if da.dtype == np.float32 else _to_reflectance(da).values
+        )
+
+    dims = ds[_index_bands(indices)[0]].dims
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for index in indices:
+            values = INDEX_FORMULAS[index](reflectance).astype(np.float32, copy=False)
+            values[~np.isfinite(values)] = np.nan
+            ds[index] = (dims, values)
+
+    return ds
+
+
+def _split_bands(
+    bands: List[str], indices: Optional[IndicesType], keep_bands: bool = True
+) -> Tuple[List[str], List[str]]:
+    """Get the bands to read and the bands to drop after computing the indices.
+
+    Bands needed only by the indices are always dropped, and with `keep_bands`
+    set to False the requested bands used by the indices are dropped as well.
+
+    Args:
+        bands (List[str]): The requested bands.
+        indices (Optional[IndicesType]): The spectral indices.
+        keep_bands (bool): Whether to keep the requested bands. Defaults to True.
+
+    Returns:
+        Tuple[List[str], List[str]]: The bands to read and the bands to drop.
+    """
+    if not indices:
+        return bands, []
+
+    index_bands = _index_bands(indices)
+    read_bands = bands + [band for band in index_bands if band not in bands]
+    drop_bands = [band for band in index_bands if band not in bands or not keep_bands]
+    return read_bands, drop_bands
@@ -4,12 +4,12 @@ import numpy as np
 from typing import List
 
 
-def _merge(df: pd.DataFrame, da_list: List[xr.DataArray]) -> xr.Dataset:
+def _merge(df: pd.DataFrame, ds_list: List[xr.Dataset]) -> xr.Dataset:
     """
-    Merge a list of DataArrays into a single Dataset.
+    Merge a list of single time step granule Datasets into a single Dataset.
     Args:
         df: DataFrame with columns 'sat_id' and 'tile_id'.
-        da_list: List of DataArrays to merge.
+        ds_list: List of granule Datasets to merge.
     Returns:
         xr.Dataset: Merged Dataset.
     """
@@ -19,12 +19,15 @@ def _merge(df: pd.DataFrame, da_list: List[xr.DataArray]) -> xr.Dataset:
 
     ds_list_to_concat = []
     for sat_id, tile_id in sat_tile_combinations.itertuples(index=False):
-        sat_tile_da_list = []
-        for da in da_list:
-            if sat_id == da.attrs["sat_id"] and tile_id == da.attrs["tile_id"]:
-                sat_tile_da_list.append(da)
+        sat_tile_ds_list = []
+        for ds in ds_list:
+            if sat_id == ds.attrs["sat_id"] and tile_id == ds.attrs["tile_id"]:
+                sat_tile_ds_list.append(ds)
 
-        merged_ds = xr.merge(sat_tile_da_list)
+        if not sat_tile_ds_list:
+            continue
+
+        merged_ds = xr.concat(sat_tile_ds_list, dim="time", combine_attrs="override")
 
         if not single_sat:
             value = 0 if sat_id == "L30" else 1
@@ -38,12 +41,6 @@ def _merge(df: pd.DataFrame, da_list: List[xr.DataArray]) -> xr.Dataset:
         merged_ds.attrs.pop("tile_id")
         merged_ds["time"].encoding["dtype"] = "float64"
 
-        for var in merged_ds.data_vars:
-            merged_ds[var] = (
-                merged_ds[var].astype(np.uint8)
-                if var == "FMASK" or var == "SAT_ID"
-                else merged_ds[var].astype(np.int16)
-            )
         ds_list_to_concat.append(merged_ds)
 
     final_ds = xr.concat(ds_list_to_concat, dim="time").sortby("time")
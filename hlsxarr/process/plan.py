@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import List, Literal, Optional
+from ..roi import RoiPolygon
+from ..types import Bands, ReflectanceType, IndicesType
+from ..utils import _get_roi_mask, _get_roi_xr_utm_cordts
+
+# HLS L30 and S30 granules are both delivered as 3660 x 3660 pixel tiles on a 30 m grid.
+PIXEL_SIZE = 30
+TILE_PIXELS = 3660 * 3660
+
+# Approximate size of a deflate compressed HLS COG relative to its raw pixel data.
+COG_COMPRESSION_RATIO = 0.5
+
+# Copies of the output cube alive at the peak of each execution mode.
+# memory: granule datasets, per-tile merge, concat and sort by time.
+# tiled: merged batches, concat and sort by time.
+MEMORY_MODE_COPIES = 4
+TILED_MODE_COPIES = 3
+
+ExecutionMode = Literal["memory", "streaming", "tiled"]
+
+
+@dataclass(frozen=True)
+class ProcessPlan:
+    """Resource estimate and execution strategy for a processing job.
+
+    Attributes:
+        n_granules (int): Number of granules (time steps) in the output.
+        n_files (int): Number of band files to download.
+        width (int): Width of the output grid in pixels.
+        height (int): Height of the output grid in pixels.
+        output_bytes (int): Estimated size of the output dataset.
+        peak_memory_bytes (int): Estimated peak working memory of the chosen mode.
+        download_bytes (int): Estimated download volume.
+        workers (int): Number of parallel workers to use.
+        batch_size (int): Number of granules read and merged at a time.
+        mode (ExecutionMode): Execution mode.
+        memory_budget_bytes (Optional[int]): Memory budget the plan was made for.
+    """
+
+    n_granules: int
+    n_files: int
+    width: int
+    height: int
+    output_bytes: int
+    peak_memory_bytes: int
+    download_bytes: int
+    workers: int
+    batch_size: int
+    mode: ExecutionMode
+    memory_budget_bytes: Optional[int] = None
+
+    @property
+    def fits_budget(self) -> bool:
+        """Whether the estimated peak memory fits within the memory budget."""
+        if self.memory_budget_bytes is None:
+            return True
+        return self.peak_memory_bytes <= self.memory_budget_bytes
+
+    def __str__(self) -> str:
+        budget = (
+            "none"
+            if self.memory_budget_bytes is None
+            else f"{self.memory_budget_bytes / 1e9:.2f} GB"
+        )
+        return (
+            f"Plan: {self.n_granules} granules, {self.n_files} files, "
+            f"grid {self.height} x {self.width}, "
+            f"output {self.output_bytes / 1e9:.2f} GB, "
+            f"peak memory {self.peak_memory_bytes / 1e9:.2f} GB, "
+            f"download {self.download_bytes / 1e9:.2f} GB, "
+            f"mode {self.mode} (workers={self.workers}, batch={self.batch_size}), "
+            f"budget {budget}"
+        )
+
+
+def _plan(
+    roi: RoiPolygon,
+    df: pd.DataFrame,
+    workers: int,
+    memory_budget_gb: Optional[float] = None,
+    reflectance: ReflectanceType = "int16",
+    indices: Optional[IndicesType] = None,
+    drop_bands: Optional[List[str]] = None,
+) -> ProcessPlan:
+    """Estimate the resources needed to process the searched files and choose an execution mode.
+
+    The job runs fully in memory when it fits the budget. Otherwise the number of
+    workers is reduced (streaming), and if that is not enough the granules are read
+    and merged in batches (tiled).
+
+    Args:
+        roi (RoiPolygon): The region of interest.
+        df (pd.DataFrame): The DataFrame returned by the search.
+        workers (int): The requested number of workers.
+        memory_budget_gb (Optional[float]): Memory budget in gigabytes. Defaults to None (unlimited).
+        reflectance (ReflectanceType): The dtype of the spectral bands. Defaults to "int16".
+        indices (Optional[IndicesType]): Spectral indices computed per granule. Defaults to None.
+        drop_bands (Optional[List[str]]): Bands dropped once the indices are computed. Defaults to None.
+
+    Returns:
+        ProcessPlan: The processing plan.
+    """
+    x_coords, y_coords = _get_roi_xr_utm_cordts(
+        roi.geometry, roi.crs, PIXEL_SIZE, PIXEL_SIZE
+    )
+    width, height = len(x_coords), len(y_coords)
+    grid_pixels = width * height
+    budget = None if memory_budget_gb is None else int(memory_budget_gb * 1e9)
+
+    if df.empty:
+        return ProcessPlan(
+            n_granules=0,
+            n_files=0,
+            width=width,
+            height=height,
+            output_bytes=0,
+            peak_memory_bytes=0,
+            download_bytes=0,
+            workers=workers,
+            batch_size=0,
+            mode="memory",
+            memory_budget_bytes=budget,
+        )
+
+    granules = df[["sat_id", "tile_id", "date"]].drop_duplicates()
+    n_granules = len(granules)
+    n_files = len(df)
+
+    itemsizes = df["band"].map(lambda band: np.dtype(Bands.DTYPES[band]).itemsize)
+    output_itemsizes = df["band"].map(
+        lambda band: np.dtype(
+            np.float32
+            if reflectance == "float32" and band in Bands.SCALE_FACTORS
+            else Bands.DTYPES[band]
+        ).itemsize
+    )
+    kept = ~df["band"].duplicated() & ~df["band"].isin(drop_bands or [])
+    granule_bytes = grid_pixels * (
+        int(output_itemsizes[kept].sum())
+        + len(indices or []) * np.dtype(np.float32).itemsize
+    )
+    if df["sat_id"].nunique() > 1:
+        # SAT_ID variable
+        granule_bytes += np.dtype(np.uint8).itemsize
+    output_bytes = n_granules * granule_bytes
+
+    # Only the blocks of a band file that intersect the ROI polygon are fetched.
+    read_pixels = min(
+        int(_get_roi_mask(roi.geometry, roi.crs, PIXEL_SIZE, PIXEL_SIZE).sum()),
+        TILE_PIXELS,
+    )
+    download_bytes = int((itemsizes * read_pixels * COG_COMPRESSION_RATIO).sum())
+
+    # A worker reads a whole granule: it holds the ROI sized arrays of all its bands
+    # and the indices, plus the fetched blocks of the current band file, compressed
+    # and decoded in the GDAL block cache.
+    download_bytes_per_file = int(
+        read_pixels * itemsizes.max() * (COG_COMPRESSION_RATIO + 1)
+    )
+    granule_read_bytes = int(
+        (grid_pixels * output_itemsizes)
+        .groupby([df["sat_id"], df["tile_id"], df["date"]])
+        .sum()
+        .max()
+        + grid_pixels * len(indices or []) * np.dtype(np.float32).itemsize
+    )
+    worker_bytes = download_bytes_per_file + granule_read_bytes
+
+    workers = max(1, min(workers, n_granules))
+
+    def in_flight(n_workers: int) -> int:
+        return n_workers * worker_bytes
+
+    mode: ExecutionMode = "memory"
+    batch_size = n_granules
+    peak = MEMORY_MODE_COPIES * output_bytes + in_flight(workers)
+
+    if budget is not None and peak > budget:
+        # Fewer concurrent downloads
+        available = budget - MEMORY_MODE_COPIES * output_bytes
+        if available >= worker_bytes:
+            mode = "streaming"
+            workers = min(workers, available // worker_bytes)
+            peak = MEMORY_MODE_COPIES * output_bytes + in_flight(workers)
+        else:
+            # Read and merge the granules in batches
+            mode = "tiled"
+            available = budget - TILED_MODE_COPIES * output_bytes - in_flight(workers)
+            if available < granule_bytes:
+                workers = 1
+                available = budget - TILED_MODE_COPIES * output_bytes - in_flight(1)
+            batch_size = int(min(n_granules, max(1, available // granule_bytes)))
+            peak = (
+                TILED_MODE_COPIES * output_bytes
+                + batch_size * granule_bytes
+                + in_flight(workers)
+            )
+
+    return ProcessPlan(
+        n_granules=n_granules,
+        n_files=n_files,
+        width=width,
+        height=height,
+        output_bytes=int(output_bytes),
+        peak_memory_bytes=int(peak),
+        download_bytes=download_bytes,
+        workers=int(workers),
+        batch_size=int(batch_size),
+        mode=mode,
+        memory_budget_bytes=budget,
+    )
+
+
+def _plan_batches(df: pd.DataFrame, batch_size: int) -> List[pd.DataFrame]:
+    """Split the searched files into batches of whole granules.
+
+    Args:
+        df (pd.DataFrame): The DataFrame returned by the search.
+        batch_size (int): Number of granules per batch.
+
+    Returns:
+        List[pd.DataFrame]: A list of DataFrames.
+    """
+    granule_ids = df.groupby(["sat_id", "tile_id", "date"], sort=True).ngroup()
+    return [batch_df for _, batch_df in df.groupby(granule_ids // max(batch_size, 1))]
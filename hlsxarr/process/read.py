@@ -1,10 +1,13 @@
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
-from .stac2xrda import _stac2xrda
+from .stac2xrda import _granule2xrds
 from ..roi import RoiPolygon
+from ..budget import DownloadBudget
+from ..types import ReflectanceType, IndicesType
+from ..hooks import ProcessHooks
 import xarray as xr
-from typing import List
+from typing import List, Optional, Sequence
 
 
 def _read(
@@ -12,17 +15,30 @@ def _read(
     df: pd.DataFrame,
     workers: int,
     edl_token: str,
-) -> List[xr.DataArray]:
-    """Read HLS data parallelly from the STAC API and return a list of xarray DataArrays.
+    download_budget: Optional[DownloadBudget] = None,
+    reflectance: ReflectanceType = "int16",
+    indices: Optional[IndicesType] = None,
+    drop_bands: Optional[List[str]] = None,
+    hooks: Sequence[ProcessHooks] = (),
+) -> List[xr.Dataset]:
+    """Read HLS data parallelly from the STAC API and return a list of xarray Datasets.
+
+    All bands of a granule are read by the same task.
 
     Args:
         roi (RoiPolygon): The region of interest.
         df (pd.DataFrame): The DataFrame containing the HLS data.
         workers (int): The number of workers to use.
         edl_token (str): The Earthdata Login token.
+        download_budget (Optional[DownloadBudget]): Download concurrency budget shared
+            with other jobs. Defaults to None.
+        reflectance (ReflectanceType): The dtype of the spectral bands. Defaults to "int16".
+        indices (Optional[IndicesType]): Spectral indices computed per granule. Defaults to None.
+        drop_bands (Optional[List[str]]): Bands dropped once the indices are computed. Defaults to None.
+        hooks (Sequence[ProcessHooks]): Hooks called around the stages run by the workers. Defaults to ().
 
     Returns:
-        List[xr.DataArray]: A list of xarray DataArrays.
+        List[xr.Dataset]: A list of single time step xarray Datasets, one per granule.
     """
 
     if not isinstance(df, pd.DataFrame):
@@ -32,37 +48,44 @@ def _read(
         raise ValueError("The input DataFrame is empty.")
 
     # Store successful reads
-    data_arrays = []
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = []
+    datasets = []
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="hlsxarr-read"
+    ) as executor:
+        futures = {}
 
         # Set up the tqdm progress bar
         with tqdm(
             total=len(df), desc="Reading HLS Data", unit="file", ncols=80
         ) as pbar:
-            for _, row in df.iterrows():
-                futures.append(
-                    executor.submit(
-                        _stac2xrda,
-                        roi.geometry,
-                        edl_token,
-                        row["stac_url"],
-                        row["date"],
-                        row["sat_id"],
-                        row["tile_id"],
-                        row["band"],
-                    )
+            for (sat_id, tile_id, date), granule_df in df.groupby(
+                ["sat_id", "tile_id", "date"], sort=False
+            ):
+                future = executor.submit(
+                    _granule2xrds,
+                    roi.geometry,
+                    edl_token,
+                    dict(zip(granule_df["band"], granule_df["stac_url"])),
+                    date,
+                    sat_id,
+                    tile_id,
+                    download_budget,
+                    reflectance,
+                    indices,
+                    drop_bands,
+                    hooks,
                 )
+                futures[future] = len(granule_df)
 
             for future in as_completed(futures):
                 try:
                     result = future.result()
-                    if isinstance(result, xr.DataArray):
-                        pbar.update(1)
-                        data_arrays.append(result)
+                    if isinstance(result, xr.Dataset):
+                        pbar.update(futures[future])
+                        datasets.append(result)
 
                 except Exception as e:
                     print(f"Error reading data: {e}")
-                    return data_arrays
+                    return datasets
 
-    return data_arrays
+    return datasets
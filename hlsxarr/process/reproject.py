@@ -4,6 +4,7 @@ import rasterio
 from rasterio.transform import from_origin, Affine
 from rasterio.warp import calculate_default_transform, reproject, Resampling
 from ..utils import _get_roi_xr_utm_cordts
+from ..types import Bands
 import warnings
 
 
@@ -55,15 +56,9 @@ def _reproject_xr_da(
     src_arr = src_xr_arr.values
     band = src_xr_arr.name
 
-    tgt_arr = np.full(tgt_shape, np.nan, dtype=np.float32)
-    if band == "Fmask":
-        tgt_arr = np.full(tgt_shape, 255, dtype=np.uint8)
-        no_data = 255
-        data_type = np.uint8
-    else:
-        tgt_arr = np.full(tgt_shape, -9999, dtype=np.int16)
-        no_data = -9999
-        data_type = np.int16
+    no_data = Bands.NODATA[band]
+    data_type = Bands.DTYPES[band]
+    tgt_arr = np.full(tgt_shape, no_data, dtype=data_type)
 
     projected_data, projected_tansform = reproject(
         src_arr,
@@ -77,12 +72,16 @@ def _reproject_xr_da(
         src_nodata=no_data,
     )
 
-    pixel_width = abs(projected_tansform.a)
-    pixel_height = abs(projected_tansform.e)
+    projected_pixel_width = abs(projected_tansform.a)
+    projected_pixel_height = abs(projected_tansform.e)
 
     # Compute the x and y coordinates for the pixel centers for projected dataarray
-    x_coords = projected_tansform.c + pixel_width * (np.arange(tgt_width) + 0.5)
-    y_coords = projected_tansform.f - pixel_height * (np.arange(tgt_height) + 0.5)
+    x_coords = projected_tansform.c + projected_pixel_width * (
+        np.arange(tgt_width) + 0.5
+    )
+    y_coords = projected_tansform.f - projected_pixel_height * (
+        np.arange(tgt_height) + 0.5
+    )
 
     # Create an xarray DataArray with dimensions ("time", "y", "x").
     projected_xr_da = xr.DataArray(
@@ -97,12 +96,12 @@ def _reproject_xr_da(
         attrs={"crs": tgt_crs},
     )
 
-    # Interpolation to the ROI based coordinates
+    # Interpolation to the ROI based coordinates, on the same cached grid as the ROI mask
     intp_tgt_x, intp_tgt_y = _get_roi_xr_utm_cordts(
         roi, tgt_crs, pixel_width, pixel_height
     )
     interpolated_da = projected_xr_da.interp(
         x=intp_tgt_x, y=intp_tgt_y, method="nearest"
-    ).astype(data_type)
+    ).astype(data_type, copy=False)
 
     return interpolated_da
@@ -0,0 +1,72 @@
+import numpy as np
+import xarray as xr
+from typing import Optional
+from ..types import Bands, ReflectanceType
+
+# Chunk size of the spatial dimensions of compressed variables
+CHUNK_SIZE = 512
+
+
+def _to_reflectance(da: xr.DataArray) -> xr.DataArray:
+    """Convert a scaled integer band to float32 surface reflectance.
+
+    Nodata pixels are set to NaN.
+
+    Args:
+        da (xr.DataArray): The scaled integer band.
+
+    Returns:
+        xr.DataArray: The float32 reflectance band.
+    """
+    band = da.name
+    values = da.values
+    reflectance = np.multiply(
+        values, np.float32(Bands.SCALE_FACTORS[band]), dtype=np.float32
+    )
+    reflectance[values == Bands.NODATA[band]] = np.nan
+
+    return da.copy(data=reflectance)
+
+
+def _set_cf_encoding(
+    ds: xr.Dataset,
+    reflectance: ReflectanceType = "int16",
+    complevel: Optional[int] = None,
+) -> xr.Dataset:
+    """Set the CF metadata and the on-disk encoding of the output dataset.
+
+    Scaled integer bands get CF `scale_factor`, `add_offset` and `_FillValue`
+    attributes, so that readers decode them to float32 reflectance. With a
+    `complevel`, the time series variables are written as zlib compressed and
+    shuffled chunks of one time step.
+
+    Args:
+        ds (xr.Dataset): The merged dataset.
+        reflectance (ReflectanceType): The dtype of the spectral bands. Defaults to "int16".
+        complevel (Optional[int]): zlib compression level (1-9). Defaults to None (uncompressed).
+
+    Returns:
+        xr.Dataset: The dataset.
+    """
+    for var in ds.data_vars:
+        scaled = var in Bands.SCALE_FACTORS and reflectance == "int16"
+        if scaled or (var in Bands.NODATA and var not in Bands.SCALE_FACTORS):
+            ds[var].attrs["_FillValue"] = np.array(
+                Bands.NODATA[var], dtype=Bands.DTYPES[var]
+            )
+        if scaled:
+            ds[var].attrs["scale_factor"] = np.float32(Bands.SCALE_FACTORS[var])
+            ds[var].attrs["add_offset"] = np.float32(0)
+
+        if complevel is not None and ds[var].ndim > 1:
+            ds[var].encoding.update(
+                zlib=True,
+                shuffle=True,
+                complevel=complevel,
+                chunksizes=tuple(
+                    1 if dim == "time" else min(CHUNK_SIZE, ds.sizes[dim])
+                    for dim in ds[var].dims
+                ),
+            )
+
+    return ds
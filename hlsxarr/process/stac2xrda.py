@@ -2,42 +2,374 @@ import math
 import requests
 import time
 import numpy as np
-from rasterio.io import MemoryFile
+import rasterio
+from rasterio.errors import RasterioIOError
+from rasterio.io import MemoryFile, DatasetReader
 from rasterio.windows import Window
 from datetime import datetime
 import xarray as xr
-from typing import Optional
-from ..utils import _get_projected_bounds, _get_roi_xr_utm_cordts, _get_bbox_utm_code
-from .reproject import _reproject_xr_da
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from ..utils import (
+    _get_projected_bounds,
+    _get_roi_xr_utm_cordts,
+    _get_bbox_utm_code,
+    _get_roi_mask,
+    _get_roi_outside_mask,
+)
+from ..budget import DownloadBudget
+from ..hooks import ProcessHooks, _stage
+from ..types import Bands, ReflectanceType, IndicesType
+from .scale import _to_reflectance
+from .indices import _compute_indices
 import threading
+from contextlib import ExitStack
 
 
 # Shared event to signal when to stop all threads
 stop_event = threading.Event()
 
 
-def _stac2xrda(
+class _RoiGrid(NamedTuple):
+    """Placement of the ROI grid within an image, shared by all bands of a granule."""
+
+    img_crs: str
+    transform: tuple
+    pixel_width: int
+    pixel_height: int
+    width: int
+    height: int
+    window: Window
+    np_row_idx: int
+    np_col_idx: int
+    x_coords: np.ndarray
+    y_coords: np.ndarray
+    roi_crs: str
+    mask: Optional[np.ndarray] = None
+    outside_mask: Optional[np.ndarray] = None
+
+
+def _get_roi_grid(dataset: DatasetReader, roi: dict) -> _RoiGrid:
+    """Get the ROI grid and read window for a dataset.
+
+    Args:
+        dataset (DatasetReader): The opened raster dataset.
+        roi (dict): The region of interest.
+
+    Returns:
+        _RoiGrid: The ROI grid.
+    """
+    # Get the dataset metadata
+    transform = dataset.transform
+    img_width = dataset.width
+    img_height = dataset.height
+    img_crs = dataset.crs.to_string()
+    pixel_width = int(transform.a)
+    pixel_height = int(-transform.e)
+
+    # Get the ROI bounds in the image CRS.
+    minx, miny, maxx, maxy = _get_projected_bounds(roi, img_crs)
+    width = math.floor((maxx - minx) / pixel_width)
+    height = math.floor((maxy - miny) / pixel_height)
+
+    # Convert ROI upper-left coordinate to dataset pixel coordinates.
+    col_offset_float, row_offset_float = ~transform * (minx, maxy)
+    col_offset = math.floor(col_offset_float)
+    row_offset = math.floor(row_offset_float)
+
+    # Clip the ROI window to the dataset boundaries.
+    col_start = max(col_offset, 0)
+    row_start = max(row_offset, 0)
+    col_stop = min(col_offset + width, img_width)
+    row_stop = min(row_offset + height, img_height)
+
+    window = Window(
+        col_start,
+        row_start,
+        max(col_stop - col_start, 0),
+        max(row_stop - row_start, 0),
+    )
+
+    # Determine the indices in the output ROI array where the source data should be placed.
+    np_col_idx = col_start - col_offset
+    np_row_idx = row_start - row_offset
+
+    # Compute the x and y coordinates for the pixel centers
+    tgt_x, tgt_y = _get_roi_xr_utm_cordts(roi, img_crs, pixel_width, pixel_height)
+
+    return _RoiGrid(
+        img_crs=img_crs,
+        transform=tuple(transform),
+        pixel_width=pixel_width,
+        pixel_height=pixel_height,
+        width=width,
+        height=height,
+        window=window,
+        np_row_idx=np_row_idx,
+        np_col_idx=np_col_idx,
+        x_coords=tgt_x,
+        y_coords=tgt_y,
+        roi_crs=_get_bbox_utm_code(roi),
+        mask=_get_roi_mask(roi, img_crs, pixel_width, pixel_height),
+        outside_mask=_get_roi_outside_mask(roi, img_crs, pixel_width, pixel_height),
+    )
+
+
+def _read_window(
+    dataset: DatasetReader,
+    grid: _RoiGrid,
+    out: np.ndarray,
+    nodata: int,
+) -> List[Window]:
+    """Boundless read of the ROI window of the first band into a destination array.
+
+    The part of the ROI inside the dataset is read directly into `out` and only
+    the part outside of it is filled with nodata, so no intermediate array is
+    allocated. When the grid has a polygon mask, only the internal blocks of the
+    dataset that intersect the polygon are read, so only those are fetched from
+    a remote dataset, and the pixels outside the polygon are set to nodata.
+
+    Args:
+        dataset (DatasetReader): The opened raster dataset.
+        grid (_RoiGrid): The ROI grid of the dataset.
+        out (np.ndarray): The (height, width) destination array, or a view of one.
+        nodata (int): The value of the pixels outside the dataset.
+
+    Returns:
+        List[Window]: The windows of the dataset that were read.
+    """
+    row, col = grid.np_row_idx, grid.np_col_idx
+    window_height, window_width = int(grid.window.height), int(grid.window.width)
+
+    if grid.mask is not None:
+        out[:] = nodata
+        windows = _intersecting_blocks(dataset, grid)
+        for block_window in windows:
+            out_row = row + int(block_window.row_off - grid.window.row_off)
+            out_col = col + int(block_window.col_off - grid.window.col_off)
+            dataset.read(
+                1,
+                window=block_window,
+                out=out[
+                    out_row : out_row + int(block_window.height),
+                    out_col : out_col + int(block_window.width),
+                ],
+            )
+        np.copyto(out, nodata, where=grid.outside_mask)
+        return windows
+
+    # Pad the pixels outside the dataset
+    out[:row] = nodata
+    out[row + window_height :] = nodata
+    out[row : row + window_height, :col] = nodata
+    out[row : row + window_height, col + window_width :] = nodata
+
+    if window_height > 0 and window_width > 0:
+        dataset.read(
+            1,
+            window=grid.window,
+            out=out[row : row + window_height, col : col + window_width],
+        )
+        return [grid.window]
+
+    return []
+
+
+def _intersecting_blocks(dataset: DatasetReader, grid: _RoiGrid) -> List[Window]:
+    """Get the parts of the internal blocks of the dataset that intersect the ROI polygon.
+
+    Args:
+        dataset (DatasetReader): The opened raster dataset.
+        grid (_RoiGrid): The ROI grid of the dataset, with a polygon mask.
+
+    Returns:
+        List[Window]: The block windows clipped to the ROI window.
+    """
+    block_height, block_width = dataset.block_shapes[0]
+    row_start, col_start = int(grid.window.row_off), int(grid.window.col_off)
+    row_stop = row_start + int(grid.window.height)
+    col_stop = col_start + int(grid.window.width)
+
+    if row_stop <= row_start or col_stop <= col_start:
+        return []
+
+    # Striped datasets are read in one go
+    if block_width >= dataset.width:
+        return [grid.window] if grid.mask.any() else []
+
+    windows = []
+    for block_row in range(row_start - row_start % block_height, row_stop, block_height):
+        for block_col in range(
+            col_start - col_start % block_width, col_stop, block_width
+        ):
+            # Block clipped to the ROI window, in dataset pixel coordinates
+            r0, r1 = max(block_row, row_start), min(block_row + block_height, row_stop)
+            c0, c1 = max(block_col, col_start), min(block_col + block_width, col_stop)
+
+            # Same block in ROI grid pixel coordinates
+            mask_row = grid.np_row_idx + r0 - row_start
+            mask_col = grid.np_col_idx + c0 - col_start
+            if grid.mask[
+                mask_row : mask_row + r1 - r0, mask_col : mask_col + c1 - c0
+            ].any():
+                windows.append(Window(c0, r0, c1 - c0, r1 - r0))
+
+    return windows
+
+
+def _blocks_nbytes(dataset: DatasetReader, windows: List[Window]) -> int:
+    """Get the compressed size of the internal blocks of the dataset covered by windows.
+
+    Args:
+        dataset (DatasetReader): The opened raster dataset.
+        windows (List[Window]): The windows read from the dataset.
+
+    Returns:
+        int: The size of the blocks in bytes.
+    """
+    block_height, block_width = dataset.block_shapes[0]
+    blocks = set()
+    for window in windows:
+        row_start, col_start = int(window.row_off), int(window.col_off)
+        row_stop = row_start + int(window.height)
+        col_stop = col_start + int(window.width)
+        for i in range(row_start // block_height, math.ceil(row_stop / block_height)):
+            for j in range(col_start // block_width, math.ceil(col_stop / block_width)):
+                blocks.add((i, j))
+
+    return sum(dataset.block_size(1, i, j) for i, j in blocks)
+
+
+def _read_roi_da(
+    dataset: DatasetReader,
+    grid: _RoiGrid,
     roi: dict,
-    token: str,
-    url: str,
-    dt: str,
+    date: datetime,
     sat_id: str,
     tile_id: str,
     band: str,
-) -> Optional[xr.DataArray]:
-    """Read HLS data from the STAC API and return an xarray DataArray.
+    hooks: Sequence[ProcessHooks] = (),
+) -> xr.DataArray:
+    """Read the ROI window of a dataset into an xarray DataArray in the ROI CRS.
 
     Args:
+        dataset (DatasetReader): The opened raster dataset.
+        grid (_RoiGrid): The ROI grid of the dataset.
         roi (dict): The region of interest.
-        token (str): The Earthdata Login token.
-        url (str): The STAC API URL.
-        dt (str): The date and time of the data.
+        date (datetime): The date and time of the data.
         sat_id (str): The satellite ID.
         tile_id (str): The tile ID.
         band (str): The band name.
+        hooks (Sequence[ProcessHooks]): Hooks called around the decode and reproject stages. Defaults to ().
 
     Returns:
-        Optional[xr.DataArray]: An xarray DataArray.
+        xr.DataArray: An xarray DataArray.
+    """
+    # Read the band straight into the array backing the DataArray.
+    with _stage(hooks, "decode", band=band, tile_id=tile_id, date=date):
+        roi_array = np.empty((1, grid.height, grid.width), dtype=Bands.DTYPES[band])
+        _read_window(dataset, grid, roi_array[0], Bands.NODATA[band])
+
+    return _roi_da(roi_array, grid, roi, date, sat_id, tile_id, band, hooks)
+
+
+def _roi_da(
+    roi_array: np.ndarray,
+    grid: _RoiGrid,
+    roi: dict,
+    date: datetime,
+    sat_id: str,
+    tile_id: str,
+    band: str,
+    hooks: Sequence[ProcessHooks] = (),
+) -> xr.DataArray:
+    """Wrap the ROI array of a band in an xarray DataArray in the ROI CRS.
+
+    Args:
+        roi_array (np.ndarray): The (1, height, width) ROI array read on the grid.
+        grid (_RoiGrid): The ROI grid of the dataset the array was read from.
+        roi (dict): The region of interest.
+        date (datetime): The date and time of the data.
+        sat_id (str): The satellite ID.
+        tile_id (str): The tile ID.
+        band (str): The band name.
+        hooks (Sequence[ProcessHooks]): Hooks called around the reproject stage. Defaults to ().
+
+    Returns:
+        xr.DataArray: An xarray DataArray.
+    """
+    # Create an xarray DataArray with dimensions ("time", "y", "x").
+    roi_da = xr.DataArray(
+        data=roi_array,
+        coords={
+            "time": [date],
+            "y": grid.y_coords,
+            "x": grid.x_coords,
+        },
+        dims=("time", "y", "x"),
+        name=band,
+        attrs={"crs": grid.img_crs, "sat_id": sat_id, "tile_id": tile_id},
+    )
+
+    # Reprojecting the ROI array to the ROI CRS if necessary.
+    if grid.img_crs != grid.roi_crs:
+        from .reproject import _reproject_xr_da
+
+        with _stage(hooks, "reproject", band=band, tile_id=tile_id, date=date):
+            roi_da = _reproject_xr_da(
+                roi_da, roi, grid.roi_crs, grid.pixel_width, grid.pixel_height
+            )
+            # Mask the pixels outside the polygon on the ROI CRS grid, which is
+            # the grid the band was interpolated to
+            np.copyto(
+                roi_da.values[0],
+                Bands.NODATA[band],
+                where=_get_roi_outside_mask(
+                    roi, grid.roi_crs, grid.pixel_width, grid.pixel_height
+                ),
+            )
+        roi_da.attrs["crs"] = grid.roi_crs
+        roi_da.attrs["sat_id"] = sat_id
+        roi_da.attrs["tile_id"] = tile_id
+
+    return roi_da
+
+
+def _download(url: str, token: str, session: Optional[requests.Session]) -> bytes:
+    """Helper function to download a file."""
+    if session is None:
+        response = requests.get(
+            url, headers={"Authorization": f"Bearer {token}"}, stream=True
+        )
+    else:
+        response = session.get(url, stream=True)
+    response.raise_for_status()
+    return response.content
+
+
+def _retry(
+    url: str,
+    attempt: Callable[[], Tuple[object, int]],
+    download_budget: Optional[DownloadBudget] = None,
+    hooks: Sequence[ProcessHooks] = (),
+    **info,
+) -> Optional[object]:
+    """Run a download attempt with retries and exponential backoff.
+
+    The wait for a download slot (queue), every download attempt (fetch) and
+    the backoff between attempts (retry) are separate stages, so queueing and
+    retries are not counted as transfer time.
+
+    Args:
+        url (str): The file URL.
+        attempt (Callable[[], Tuple[object, int]]): Downloads the file and returns
+            the result and the number of bytes downloaded.
+        download_budget (Optional[DownloadBudget]): Shared download concurrency budget. Defaults to None.
+        hooks (Sequence[ProcessHooks]): Hooks called around the stages. Defaults to ().
+        **info: Extra stage information passed to the hooks.
+
+    Returns:
+        Optional[object]: The result of the attempt.
     """
 
     retries = 5  # Maximum number of retries
@@ -50,113 +382,239 @@ def _stac2xrda(
         print(f"Skipping request for {url}")
         return None
 
-    for attempt in range(retries):
+    for attempt_idx in range(retries):
         try:
-            response = requests.get(
-                url, headers={"Authorization": f"Bearer {token}"}, stream=True
-            )
-            response.raise_for_status()
-
-            with MemoryFile(response.content) as memfile:
-                with memfile.open() as dataset:
-                    # Get the dataset metadata
-                    transform = dataset.transform
-                    img_width = dataset.width
-                    img_height = dataset.height
-                    img_crs = dataset.crs.to_string()
-                    pixel_width = int(transform.a)
-                    pixel_height = int(-transform.e)
-
-                    # Get the ROI bounds in the image CRS.
-                    minx, miny, maxx, maxy = _get_projected_bounds(roi, img_crs)
-                    width = math.floor((maxx - minx) / pixel_width)
-                    height = math.floor((maxy - miny) / pixel_height)
-
-                    # Convert ROI upper-left coordinate to dataset pixel coordinates.
-                    col_offset_float, row_offset_float = ~transform * (minx, maxy)
-                    col_offset = math.floor(col_offset_float)
-                    row_offset = math.floor(row_offset_float)
-
-                    # Determine the indices in the output ROI array where the source data should be placed.
-                    np_col_idx = abs(col_offset) if col_offset < 0 else 0
-                    np_row_idx = abs(row_offset) if row_offset < 0 else 0
-
-                    # Adjust the window size if the ROI exceeds dataset boundaries.
-                    if (col_offset + width) > img_width:
-                        window_width = img_width - col_offset
-                    else:
-                        window_width = width
-
-                    if (row_offset + height) > img_height:
-                        window_height = img_height - row_offset
-                    else:
-                        window_height = height
-
-                    window = Window(col_offset, row_offset, window_width, window_height)
-
-                    # Read the first band from the dataset within the computed window.
-                    data = dataset.read(window=window)
-
-                    if band == "Fmask":
-                        roi_array = np.full((height, width), 255, dtype=np.uint8)
-                    else:
-                        roi_array = np.full((height, width), -9999, dtype=np.int16)
-
-                    # Place the read data into the ROI array at the correct position.
-                    roi_array[
-                        np_row_idx : np_row_idx + window_height,
-                        np_col_idx : np_col_idx + window_width,
-                    ] = data[0]
-
-                    date = datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S.%fZ")
-
-                    # Compute the x and y coordinates for the pixel centers
-                    tgt_x, tgt_y = _get_roi_xr_utm_cordts(
-                        roi, img_crs, pixel_width, pixel_height
-                    )
-
-                    # Create an xarray DataArray with dimensions ("time", "y", "x").
-                    roi_da = xr.DataArray(
-                        data=roi_array[None, :, :],
-                        coords={
-                            "time": [date],
-                            "y": tgt_y,
-                            "x": tgt_x,
-                        },
-                        dims=("time", "y", "x"),
-                        name=band,
-                        attrs={"crs": img_crs, "sat_id": sat_id, "tile_id": tile_id},
-                    )
-
-                    # Reprojecting the ROI array to the ROI CRS if necessary.
-                    roi_crs = _get_bbox_utm_code(roi)
-                    if img_crs != roi_crs:
-                        roi_da = _reproject_xr_da(
-                            roi_da, roi, roi_crs, pixel_width, pixel_height
-                        )
-                        roi_da.attrs["crs"] = roi_crs
-                        roi_da.attrs["sat_id"] = sat_id
-                        roi_da.attrs["tile_id"] = tile_id
-
-                    return roi_da
-
-        except requests.RequestException as e:
+            with ExitStack() as stack:
+                if download_budget is not None:
+                    with _stage(hooks, "queue", url=url, **info):
+                        stack.enter_context(download_budget.slot())
+
+                with _stage(
+                    hooks, "fetch", url=url, attempt=attempt_idx + 1, **info
+                ) as fetch_info:
+                    result, n_bytes = attempt()
+                    fetch_info["bytes"] = n_bytes
+
+            if download_budget is not None:
+                download_budget.record(n_bytes)
+            return result
+
+        except (requests.RequestException, RasterioIOError) as e:
             if "401" in str(e) or "403" in str(e):
                 print(f"Credential error. Check the validity of the token: {e}")
                 print("Exiting...")
                 # Early stopping for 401
                 stop_event.set()
-                break
+                return None
 
-            print(f"Attempt {attempt + 1} failed: {e}")
-            if attempt < retries - 1:
+            print(f"Attempt {attempt_idx + 1} failed: {e}")
+            if attempt_idx < retries - 1:
                 delay = min(delay * 2, max_delay)  # Exponential backoff
                 print(f"Retrying in {delay} seconds...")
-                time.sleep(delay)  # Wait before retrying
+                with _stage(hooks, "retry", url=url, attempt=attempt_idx + 1, **info):
+                    time.sleep(delay)  # Wait before retrying
             else:
                 print("Max retries reached. Request failed.")
                 return None
 
-        except Exception as e:
-            print(f"Error during processing: {e}")
-            return None
+
+def _fetch(
+    url: str,
+    token: str,
+    session: Optional[requests.Session] = None,
+    download_budget: Optional[DownloadBudget] = None,
+    hooks: Sequence[ProcessHooks] = (),
+    **info,
+) -> Optional[bytes]:
+    """Download a whole file with retries and exponential backoff.
+
+    Args:
+        url (str): The file URL.
+        token (str): The Earthdata Login token.
+        session (Optional[requests.Session]): Session to reuse the connection of. Defaults to None.
+        download_budget (Optional[DownloadBudget]): Shared download concurrency budget. Defaults to None.
+        hooks (Sequence[ProcessHooks]): Hooks called around the stages. Defaults to ().
+        **info: Extra stage information passed to the hooks.
+
+    Returns:
+        Optional[bytes]: The file content.
+    """
+
+    def download() -> Tuple[bytes, int]:
+        content = _download(url, token, session)
+        return content, len(content)
+
+    return _retry(url, download, download_budget, hooks, **info)
+
+
+def _vsicurl(url: str) -> str:
+    """Get the GDAL path of a remote file read with ranged HTTP requests."""
+    return f"/vsicurl/{url}"
+
+
+def _gdal_options(token: str) -> dict:
+    """GDAL configuration options for the ranged reads of the band files."""
+    return {
+        "GDAL_HTTP_HEADERS": f"Authorization: Bearer {token}",
+        # Do not list the remote directory when a file is opened
+        "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+        "CPL_VSIL_CURL_ALLOWED_EXTENSIONS": ".tif",
+        # Fetch adjacent blocks with a single request
+        "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+    }
+
+
+def _read_blocks(
+    url: str,
+    roi: dict,
+    band: str,
+    grid: Optional[_RoiGrid] = None,
+) -> Tuple[Tuple[_RoiGrid, np.ndarray], int]:
+    """Read the ROI of a remote band file, fetching only the blocks it needs.
+
+    Args:
+        url (str): The band file URL.
+        roi (dict): The region of interest.
+        band (str): The band name.
+        grid (Optional[_RoiGrid]): The ROI grid of another band of the granule,
+            reused when the file has the same grid. Defaults to None.
+
+    Returns:
+        Tuple[Tuple[_RoiGrid, np.ndarray], int]: The ROI grid and the
+            (1, height, width) ROI array, and the compressed size of the blocks read.
+    """
+    with rasterio.open(_vsicurl(url)) as dataset:
+        if (
+            grid is None
+            or grid.transform != tuple(dataset.transform)
+            or grid.img_crs != dataset.crs.to_string()
+        ):
+            grid = _get_roi_grid(dataset, roi)
+
+        roi_array = np.empty((1, grid.height, grid.width), dtype=Bands.DTYPES[band])
+        windows = _read_window(dataset, grid, roi_array[0], Bands.NODATA[band])
+
+        return (grid, roi_array), _blocks_nbytes(dataset, windows)
+
+
+def _stac2xrda(
+    roi: dict,
+    token: str,
+    url: str,
+    dt: str,
+    sat_id: str,
+    tile_id: str,
+    band: str,
+) -> Optional[xr.DataArray]:
+    """Read HLS data from the STAC API and return an xarray DataArray.
+
+    Args:
+        roi (dict): The region of interest.
+        token (str): The Earthdata Login token.
+        url (str): The STAC API URL.
+        dt (str): The date and time of the data.
+        sat_id (str): The satellite ID.
+        tile_id (str): The tile ID.
+        band (str): The band name.
+
+    Returns:
+        Optional[xr.DataArray]: An xarray DataArray.
+    """
+
+    content = _fetch(url, token)
+    if content is None:
+        return None
+
+    try:
+        with MemoryFile(content) as memfile:
+            with memfile.open() as dataset:
+                grid = _get_roi_grid(dataset, roi)
+                date = datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S.%fZ")
+                return _read_roi_da(dataset, grid, roi, date, sat_id, tile_id, band)
+
+    except Exception as e:
+        print(f"Error during processing: {e}")
+        return None
+
+
+def _granule2xrds(
+    roi: dict,
+    token: str,
+    urls: Dict[str, str],
+    dt: str,
+    sat_id: str,
+    tile_id: str,
+    download_budget: Optional[DownloadBudget] = None,
+    reflectance: ReflectanceType = "int16",
+    indices: Optional[IndicesType] = None,
+    drop_bands: Optional[List[str]] = None,
+    hooks: Sequence[ProcessHooks] = (),
+) -> Optional[xr.Dataset]:
+    """Read all bands of an HLS granule and return a single time step xarray Dataset.
+
+    The band files are read with ranged HTTP requests through GDAL's /vsicurl/,
+    so only the internal blocks that intersect the ROI polygon are fetched. The
+    ROI grid is resolved once from the first band and reused for the other
+    bands, which share the same grid.
+
+    Args:
+        roi (dict): The region of interest.
+        token (str): The Earthdata Login token.
+        urls (Dict[str, str]): The band file URLs keyed by band name.
+        dt (str): The date and time of the data.
+        sat_id (str): The satellite ID.
+        tile_id (str): The tile ID.
+        download_budget (Optional[DownloadBudget]): Shared download concurrency budget. Defaults to None.
+        reflectance (ReflectanceType): "int16" keeps the scaled integer bands, "float32"
+            converts them to reflectance. Defaults to "int16".
+        indices (Optional[IndicesType]): Spectral indices to compute. Defaults to None.
+        drop_bands (Optional[List[str]]): Bands to drop once the indices are computed. Defaults to None.
+        hooks (Sequence[ProcessHooks]): Hooks called around every stage. Defaults to ().
+
+    Returns:
+        Optional[xr.Dataset]: An xarray Dataset with one variable per band, or None
+            if any band could not be read.
+    """
+
+    date = datetime.strptime(dt, "%Y-%m-%dT%H:%M:%S.%fZ")
+    grid = None
+    da_list = []
+
+    with rasterio.Env(**_gdal_options(token)):
+        for band, url in urls.items():
+            try:
+                result = _retry(
+                    url,
+                    partial(_read_blocks, url, roi, band, grid),
+                    download_budget,
+                    hooks,
+                    band=band,
+                    tile_id=tile_id,
+                )
+                if result is None:
+                    return None
+                grid, roi_array = result
+
+                roi_da = _roi_da(
+                    roi_array, grid, roi, date, sat_id, tile_id, band, hooks
+                )
+                if reflectance == "float32" and band in Bands.SCALE_FACTORS:
+                    roi_da = _to_reflectance(roi_da)
+                da_list.append(roi_da)
+
+            except Exception as e:
+                print(f"Error during processing: {e}")
+                return None
+
+    granule_ds = xr.Dataset(
+        {da.name: da for da in da_list},
+        attrs={"crs": grid.roi_crs, "sat_id": sat_id, "tile_id": tile_id},
+    )
+
+    if indices:
+        with _stage(hooks, "indices", tile_id=tile_id, date=date):
+            granule_ds = _compute_indices(granule_ds, indices)
+    if drop_bands:
+        granule_ds = granule_ds.drop_vars(drop_bands)
+
+    return granule_ds
@@ -1,9 +1,10 @@
-from .utils import _get_projected_bounds, _get_bbox_utm_code
+from .utils import _get_projected_polygon, _get_bbox_utm_code
 from .exceptions import AreaTooLargeError
+from typing import Optional
 
 
 class RoiPolygon:
-    def __init__(self, geometry: dict, max_area_km2: float):
+    def __init__(self, geometry: dict, max_area_km2: Optional[float] = None):
         self.geometry = geometry
         self._crs = _get_bbox_utm_code(self.geometry)
         self._area = self._calculate_area()
@@ -19,13 +20,13 @@ class RoiPolygon:
                 "Invalid ROI type. Only Geojson Polygon Geometry is supported."
             )
 
-        if self._area > self._max_area_km2:
+        if self._max_area_km2 is not None and self._area > self._max_area_km2:
             raise AreaTooLargeError(self._area, self._max_area_km2)
 
     def _calculate_area(self) -> float:
-        """Helper function to calculate the area of the ROI."""
-        minx, miny, maxx, maxy = _get_projected_bounds(self.geometry, self._crs)
-        return round((maxx - minx) * (maxy - miny) / 1e6, 2)
+        """Helper function to calculate the area of the ROI polygon."""
+        polygon = _get_projected_polygon(self.geometry, self._crs)
+        return round(polygon.area / 1e6, 2)
 
     @property
     def area(self) -> float:
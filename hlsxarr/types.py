@@ -16,6 +16,10 @@ BandsType = List[
 
 CollectionType = List[Literal["HLSL30.v2.0", "HLSS30.v2.0"]]
 
+ReflectanceType = Literal["int16", "float32"]
+
+IndicesType = List[Literal["NDVI", "NBR", "NDWI", "EVI"]]
+
 
 class Bands:
     BANDS = {
@@ -51,6 +55,39 @@ class Bands:
         "FMASK": "Fmask",
     }
 
+    DTYPES = {
+        "CA": "int16",
+        "BLUE": "int16",
+        "GREEN": "int16",
+        "RED": "int16",
+        "NIR": "int16",
+        "SWIR1": "int16",
+        "SWIR2": "int16",
+        "FMASK": "uint8",
+    }
+
+    NODATA = {
+        "CA": -9999,
+        "BLUE": -9999,
+        "GREEN": -9999,
+        "RED": -9999,
+        "NIR": -9999,
+        "SWIR1": -9999,
+        "SWIR2": -9999,
+        "FMASK": 255,
+    }
+
+    # Scale factors of the spectral bands to surface reflectance
+    SCALE_FACTORS = {
+        "CA": 0.0001,
+        "BLUE": 0.0001,
+        "GREEN": 0.0001,
+        "RED": 0.0001,
+        "NIR": 0.0001,
+        "SWIR1": 0.0001,
+        "SWIR2": 0.0001,
+    }
+
     @staticmethod
     def is_valid_band(band: str) -> bool:
         """Check if a band is valid."""
@@ -67,3 +104,18 @@ class Collections:
     def is_valid_collection(collection: str) -> bool:
         """Check if a collection is valid."""
         return collection in Collections.COLLECTIONS
+
+
+class Indices:
+    # Bands needed to compute each spectral index
+    INDICES = {
+        "NDVI": ["NIR", "RED"],
+        "NBR": ["NIR", "SWIR2"],
+        "NDWI": ["GREEN", "NIR"],
+        "EVI": ["NIR", "RED", "BLUE"],
+    }
+
+    @staticmethod
+    def is_valid_index(index: str) -> bool:
+        """Check if a spectral index is valid."""
+        return index in Indices.INDICES
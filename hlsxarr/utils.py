@@ -1,9 +1,15 @@
 from shapely.geometry import shape, Polygon
 from pyproj import Transformer
+from functools import lru_cache
 from typing import List, Optional
+import json
 import math
+import threading
 import numpy as np
 
+# pyproj transformers are not thread safe, so every thread keeps its own cache.
+_local = threading.local()
+
 
 def _get_bbox_utm_code(geometry: dict) -> str:
     """Get the UTM CRS code for the geometry"""
@@ -22,31 +28,82 @@ def _get_bbox_utm_code(geometry: dict) -> str:
     return utm_crs
 
 
+def _get_transformer(src_crs: str, dst_crs: str) -> Transformer:
+    """Get a cached transformer between two CRS for the current thread"""
+    transformers = getattr(_local, "transformers", None)
+    if transformers is None:
+        transformers = _local.transformers = {}
+
+    key = (str(src_crs), str(dst_crs))
+    transformer = transformers.get(key)
+    if transformer is None:
+        transformer = Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+        transformers[key] = transformer
+
+    return transformer
+
+
+def _geometry_key(geometry: dict) -> str:
+    """Get a hashable key for a GeoJSON geometry dictionary"""
+    return json.dumps(geometry, sort_keys=True)
+
+
 def _get_projected_bounds(geometry, image_crs) -> Optional[List[float]]:
     """Projecting WGS84 ROI to image UTM projection"""
-    geometry = shape(geometry)
+    return _get_projected_bounds_cached(_geometry_key(geometry), str(image_crs))
+
+
+@lru_cache(maxsize=256)
+def _get_projected_bounds_cached(geometry_key: str, image_crs: str) -> Optional[tuple]:
+    """Cached projection of the ROI bounds, keyed on the geometry and the image CRS"""
+    polygon = _get_projected_polygon_cached(geometry_key, image_crs)
 
-    # Initialize the transformer for CRS transformation
-    transformer = Transformer.from_crs("EPSG:4326", image_crs, always_xy=True)
+    if polygon is None:
+        return None
+
+    # Calculate the bounding box (minx, miny, maxx, maxy)
+    return tuple(float(bound) for bound in polygon.bounds)
+
+
+def _get_projected_polygon(geometry: dict, image_crs: str) -> Optional[Polygon]:
+    """Projecting WGS84 ROI polygon to image UTM projection"""
+    return _get_projected_polygon_cached(_geometry_key(geometry), str(image_crs))
+
+
+@lru_cache(maxsize=256)
+def _get_projected_polygon_cached(
+    geometry_key: str, image_crs: str
+) -> Optional[Polygon]:
+    """Cached projection of the ROI polygon, keyed on the geometry and the image CRS"""
+    geometry = shape(json.loads(geometry_key))
 
     if isinstance(geometry, Polygon):
-        # Transform the exterior coordinates
-        exterior_coords = [
-            transformer.transform(x, y) for x, y in geometry.exterior.coords
-        ]
-        # Create a new Polygon with transformed coordinates (no interior handling)
-        transformed_geometry = Polygon(exterior_coords)
-        # Calculate the bounding box (minx, miny, maxx, maxy)
-        minx, miny, maxx, maxy = transformed_geometry.bounds
-        return minx, miny, maxx, maxy
+        transformer = _get_transformer("EPSG:4326", image_crs)
+
+        def transform_ring(ring) -> np.ndarray:
+            xs, ys = np.asarray(ring.coords)[:, :2].T
+            return np.column_stack(transformer.transform(xs, ys))
+
+        return Polygon(
+            transform_ring(geometry.exterior),
+            [transform_ring(interior) for interior in geometry.interiors],
+        )
 
     return None
 
 
 def _get_roi_xr_utm_cordts(roi: dict, crs: str, pixel_w: int, pixel_h: int) -> tuple:
     """Get the x and y coordinates of the ROI in UTM projection for xr dataarray"""
+    return _get_roi_xr_utm_cordts_cached(_geometry_key(roi), str(crs), pixel_w, pixel_h)
+
+
+@lru_cache(maxsize=256)
+def _get_roi_xr_utm_cordts_cached(
+    geometry_key: str, crs: str, pixel_w: int, pixel_h: int
+) -> tuple:
+    """Cached ROI pixel center coordinates, keyed on the geometry, CRS and pixel size"""
     # Get the bounds of the ROI in UTM coordinates
-    minx, miny, maxx, maxy = _get_projected_bounds(roi, crs)
+    minx, miny, maxx, maxy = _get_projected_bounds_cached(geometry_key, crs)
     # Get the width and height of the ROI in pixels
     width = math.floor((maxx - minx) / pixel_w)
     height = math.floor((maxy - miny) / pixel_h)
@@ -55,4 +112,62 @@ def _get_roi_xr_utm_cordts(roi: dict, crs: str, pixel_w: int, pixel_h: int) -> t
     x_coords = minx + pixel_w * (np.arange(width) + 0.5)
     y_coords = maxy - pixel_h * (np.arange(height) + 0.5)
 
+    # The arrays are shared between callers
+    x_coords.flags.writeable = False
+    y_coords.flags.writeable = False
+
     return x_coords, y_coords
+
+
+def _get_roi_mask(roi: dict, crs: str, pixel_w: int, pixel_h: int) -> np.ndarray:
+    """Get the mask of the ROI polygon on the ROI grid, True for the pixels inside"""
+    return _get_roi_mask_cached(_geometry_key(roi), str(crs), pixel_w, pixel_h)
+
+
+@lru_cache(maxsize=256)
+def _get_roi_mask_cached(
+    geometry_key: str, crs: str, pixel_w: int, pixel_h: int
+) -> np.ndarray:
+    """Cached ROI polygon mask, keyed on the geometry, CRS and pixel size"""
+    from rasterio.features import geometry_mask
+    from rasterio.transform import from_origin
+
+    polygon = _get_projected_polygon_cached(geometry_key, crs)
+    minx, miny, maxx, maxy = _get_projected_bounds_cached(geometry_key, crs)
+    # Same grid as the ROI pixel center coordinates
+    x_coords, y_coords = _get_roi_xr_utm_cordts_cached(
+        geometry_key, crs, pixel_w, pixel_h
+    )
+
+    # Pixels whose center is inside the polygon
+    mask = geometry_mask(
+        [polygon],
+        out_shape=(len(y_coords), len(x_coords)),
+        transform=from_origin(minx, maxy, pixel_w, pixel_h),
+        invert=True,
+    )
+
+    # The mask is shared between callers
+    mask.flags.writeable = False
+
+    return mask
+
+
+def _get_roi_outside_mask(
+    roi: dict, crs: str, pixel_w: int, pixel_h: int
+) -> np.ndarray:
+    """Get the mask of the ROI grid pixels outside the ROI polygon"""
+    return _get_roi_outside_mask_cached(_geometry_key(roi), str(crs), pixel_w, pixel_h)
+
+
+@lru_cache(maxsize=256)
+def _get_roi_outside_mask_cached(
+    geometry_key: str, crs: str, pixel_w: int, pixel_h: int
+) -> np.ndarray:
+    """Cached inverse of the ROI polygon mask, so that it is not built for every band"""
+    outside = ~_get_roi_mask_cached(geometry_key, crs, pixel_w, pixel_h)
+
+    # The mask is shared between callers
+    outside.flags.writeable = False
+
+    return outside
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+import xarray as xr
+from hlsxarr.exceptions import InvalidIndexError
+from hlsxarr.process.indices import _compute_indices, _index_bands, _split_bands
+
+
+@pytest.fixture
+def granule_ds():
+    def band(values, dtype=np.int16):
+        return (("time", "y", "x"), np.array([[values]], dtype=dtype))
+
+    return xr.Dataset(
+        {
+            "BLUE": band([500, 500, -9999]),
+            "RED": band([1000, 0, 1000]),
+            "NIR": band([3000, 0, 3000]),
+        },
+        coords={"time": [np.datetime64("2025-01-02")], "y": [0], "x": [0, 1, 2]},
+    )
+
+
+def test_index_bands():
+    assert _index_bands(["NDVI", "EVI"]) == ["NIR", "RED", "BLUE"]
+
+    with pytest.raises(InvalidIndexError):
+        _index_bands(["SAVI"])
+
+
+def test_split_bands():
+    assert _split_bands(["RED", "FMASK"], None) == (["RED", "FMASK"], [])
+    assert _split_bands(["RED", "FMASK"], ["NDVI"]) == (
+        ["RED", "FMASK", "NIR"],
+        ["NIR"],
+    )
+    assert _split_bands(["RED", "FMASK"], ["NDVI"], keep_bands=False) == (
+        ["RED", "FMASK", "NIR"],
+        ["NIR", "RED"],
+    )
+
+
+def test_compute_indices(granule_ds):
+    ds = _compute_indices(granule_ds, ["NDVI", "EVI"])
+
+    assert ds["NDVI"].dtype == np.float32
+    assert ds["NDVI"].dims == ("time", "y", "x")
+    np.testing.assert_allclose(ds["NDVI"].values[0, 0, 0], 0.5, rtol=1e-6)
+    # 0 / 0
+    assert np.isnan(ds["NDVI"].values[0, 0, 1])
+    np.testing.assert_allclose(
+        ds["EVI"].values[0, 0, 0], 2.5 * 0.2 / (0.3 + 0.6 - 0.375 + 1), rtol=1e-6
+    )
+    # BLUE nodata
+    assert np.isnan(ds["EVI"].values[0, 0, 2])
+    assert not np.isnan(ds["NDVI"].values[0, 0, 2])
@@ -0,0 +1,119 @@
+import pytest
+import pandas as pd
+from hlsxarr.roi import RoiPolygon
+from hlsxarr.process.plan import _plan, _plan_batches
+
+
+@pytest.fixture
+def roi():
+    # ROI CRS (UTM Zone 17N, EPSG:32617)
+    return RoiPolygon(
+        geometry={
+            "coordinates": [
+                [
+                    [-78.60065306329707, 36.723116361254284],
+                    [-78.60065306329707, 36.60070088520398],
+                    [-78.33799755283125, 36.60070088520398],
+                    [-78.33799755283125, 36.723116361254284],
+                    [-78.60065306329707, 36.723116361254284],
+                ]
+            ],
+            "type": "Polygon",
+        }
+    )
+
+
+@pytest.fixture
+def df():
+    rows = []
+    for sat_id, tile_id, date in [
+        ("S30", "T17SQA", "2025-01-02T16:13:06.729Z"),
+        ("S30", "T17SQA", "2025-01-04T16:13:06.729Z"),
+        ("L30", "T17SQA", "2025-01-03T16:13:06.729Z"),
+    ]:
+        for band in ["RED", "NIR", "FMASK"]:
+            rows.append(
+                {
+                    "sat_id": sat_id,
+                    "tile_id": tile_id,
+                    "date": date,
+                    "stac_url": f"https://test.url/{sat_id}.{date}.{band}.tif",
+                    "band": band,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def test_plan_without_budget(roi, df):
+    plan = _plan(roi=roi, df=df, workers=8)
+
+    assert plan.n_granules == 3
+    assert plan.n_files == 9
+    # int16 + int16 + uint8 per pixel and the SAT_ID variable per granule
+    assert plan.output_bytes == 3 * (plan.width * plan.height * 5 + 1)
+    assert plan.mode == "memory"
+    # A worker reads a whole granule
+    assert plan.workers == 3
+    assert plan.fits_budget
+
+
+def test_plan_streaming_and_tiled(roi, df):
+    unlimited = _plan(roi=roi, df=df, workers=8)
+
+    streaming = _plan(
+        roi=roi,
+        df=df,
+        workers=8,
+        memory_budget_gb=(unlimited.peak_memory_bytes - 1) / 1e9,
+    )
+    assert streaming.mode == "streaming"
+    assert streaming.workers < 8
+    assert streaming.fits_budget
+
+    # Room for the tiled copies, a single worker and half of the output
+    worker_bytes = _plan(roi=roi, df=df, workers=1).peak_memory_bytes - 4 * (
+        unlimited.output_bytes
+    )
+    tiled = _plan(
+        roi=roi,
+        df=df,
+        workers=8,
+        memory_budget_gb=(3.5 * unlimited.output_bytes + worker_bytes) / 1e9,
+    )
+    assert tiled.mode == "tiled"
+    assert tiled.workers == 1
+    assert tiled.batch_size == 1
+    assert tiled.fits_budget
+
+    too_small = _plan(roi=roi, df=df, workers=8, memory_budget_gb=1e-6)
+    assert not too_small.fits_budget
+
+
+def test_plan_in_flight_per_granule(roi, df):
+    def worker_bytes(df, **kwargs):
+        plan = _plan(roi=roi, df=df, workers=1, **kwargs)
+        return plan.peak_memory_bytes - 4 * plan.output_bytes
+
+    # Two more int16 bands per granule, read for the indices and dropped
+    extra = df[df["band"] == "RED"].assign(band="GREEN")
+    extra = pd.concat([extra, extra.assign(band="BLUE")])
+    wide_df = pd.concat([df, extra], ignore_index=True)
+
+    plan = _plan(roi=roi, df=df, workers=1)
+    wide_plan = _plan(roi=roi, df=wide_df, workers=1, drop_bands=["GREEN", "BLUE"])
+
+    # The output is the same, but every worker holds the bands of a whole granule
+    assert wide_plan.output_bytes == plan.output_bytes
+    assert worker_bytes(wide_df, drop_bands=["GREEN", "BLUE"]) - worker_bytes(
+        df
+    ) == 2 * 2 * plan.width * plan.height
+    assert worker_bytes(df) > 5 * plan.width * plan.height
+
+
+def test_plan_batches(df):
+    batches = _plan_batches(df, batch_size=2)
+
+    assert [len(batch) for batch in batches] == [6, 3]
+    # Bands of a granule are never split across batches
+    for batch in batches:
+        assert (batch.groupby(["sat_id", "tile_id", "date"]).size() == 3).all()
@@ -0,0 +1,45 @@
+import numpy as np
+import xarray as xr
+from hlsxarr.process.scale import _to_reflectance, _set_cf_encoding
+
+
+def _dataset():
+    return xr.Dataset(
+        {
+            "RED": (
+                ("time", "x", "y"),
+                np.array([[[-9999, 1000], [2000, 3000]]], dtype=np.int16),
+            ),
+            "FMASK": (("time", "x", "y"), np.array([[[255, 1], [2, 3]]], np.uint8)),
+            "SAT_ID": (("time",), np.array([1], dtype=np.uint8)),
+        },
+        coords={"time": [np.datetime64("2025-01-02")], "x": [0, 1], "y": [1, 0]},
+    )
+
+
+def test_to_reflectance():
+    reflectance = _to_reflectance(_dataset()["RED"])
+
+    assert reflectance.dtype == np.float32
+    assert np.isnan(reflectance.values[0, 0, 0])
+    np.testing.assert_allclose(reflectance.values[0, 1], [0.2, 0.3], rtol=1e-6)
+
+
+def test_cf_encoding_roundtrip(tmp_path):
+    ds = _set_cf_encoding(_dataset(), reflectance="int16", complevel=4)
+
+    assert ds["RED"].dtype == np.int16
+    assert ds["RED"].encoding["zlib"]
+    assert ds["RED"].encoding["chunksizes"] == (1, 2, 2)
+    assert "zlib" not in ds["SAT_ID"].encoding
+
+    ds.to_netcdf(tmp_path / "out.nc")
+    with xr.open_dataset(tmp_path / "out.nc") as decoded:
+        # CF decoding gives float32 reflectance rather than float64
+        assert decoded["RED"].dtype == np.float32
+        assert np.isnan(decoded["RED"].values[0, 0, 0])
+        np.testing.assert_allclose(decoded["RED"].values[0, 1], [0.2, 0.3], rtol=1e-6)
+
+    with xr.open_dataset(tmp_path / "out.nc", mask_and_scale=False) as raw:
+        assert raw["RED"].dtype == np.int16
+        assert raw["FMASK"].dtype == np.uint8
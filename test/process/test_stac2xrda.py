@@ -1,10 +1,24 @@
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import numpy as np
 import xarray as xr
 from rasterio.transform import from_origin
 from rasterio.crs import CRS
-from hlsxarr.process.stac2xrda import _stac2xrda
+import requests
+from hlsxarr.budget import DownloadBudget
+from hlsxarr.hooks import ProcessHooks
+from hlsxarr.process.stac2xrda import (
+    _fetch,
+    _stac2xrda,
+    _granule2xrds,
+    _read_window,
+    _intersecting_blocks,
+    _blocks_nbytes,
+    _get_roi_grid,
+    _RoiGrid,
+)
+from hlsxarr.utils import _get_roi_outside_mask
+from rasterio.windows import Window
 import rasterio
 
 
@@ -91,6 +105,13 @@ def test_stac2xrda_with_reproject(
     mock_memory_file.assert_called_once()
     assert da.attrs["crs"] == "EPSG:32617"
 
+    # Pixels outside the polygon are masked on the ROI CRS grid after reprojection
+    outside = _get_roi_outside_mask(roi, "EPSG:32617", 30, 30)
+    assert outside.shape == da.shape[1:]
+    assert outside.any()
+    assert (da.values[0][outside] == -9999).all()
+    assert (da.values[0][~outside] == 1).any()
+
 
 @patch("hlsxarr.process.stac2xrda.requests.get")
 @patch("hlsxarr.process.stac2xrda.MemoryFile")
@@ -122,3 +143,220 @@ def test_stac2xrda_without_reproject(
     assert isinstance(da, xr.DataArray), "Expected result to be an xarray DataArray"
     mock_memory_file.assert_called_once()
     assert da.attrs["crs"] == "EPSG:32617"
+
+
+# Helper function to create a tiled GeoTIFF file read in place of a remote COG
+def create_raster_file(path, same_crs: bool, block_size: int = 64):
+    memfile = create_in_memory_raster(same_crs)
+    with memfile.open() as src:
+        profile = src.profile
+        data = src.read(1)
+    profile.update(
+        tiled=True, blockxsize=block_size, blockysize=block_size, compress="deflate"
+    )
+    with rasterio.open(path, "w", **profile) as dataset:
+        dataset.write(data, 1)
+    return str(path)
+
+
+@pytest.fixture
+def remote_files(tmp_path):
+    """Band files served to /vsicurl/ from the local disk, keyed by URL."""
+    files = {}
+    with patch(
+        "hlsxarr.process.stac2xrda._vsicurl", side_effect=lambda url: files[url]
+    ):
+        yield files, tmp_path
+
+
+def test_granule2xrds(remote_files, roi):
+    files, tmp_path = remote_files
+    urls = {"RED": "https://test.url/B04.tif", "NIR": "https://test.url/B8A.tif"}
+    for band, url in urls.items():
+        files[url] = create_raster_file(tmp_path / f"{band}.tif", same_crs=True)
+    budget = DownloadBudget(1)
+
+    ds = _granule2xrds(
+        roi=roi,
+        token="test_token",
+        urls=urls,
+        dt="2025-01-02T16:13:06.729Z",
+        sat_id="S30",
+        tile_id="T17SQA",
+        download_budget=budget,
+    )
+
+    assert isinstance(ds, xr.Dataset), "Expected result to be an xarray Dataset"
+    assert set(ds.data_vars) == {"RED", "NIR"}
+    assert ds.sizes["time"] == 1
+    assert ds.attrs["crs"] == "EPSG:32617"
+    assert ds.attrs["sat_id"] == "S30"
+    assert ds.attrs["tile_id"] == "T17SQA"
+    assert budget.files == 2
+    assert 0 < budget.bytes
+
+
+def test_granule2xrds_fetches_polygon_blocks(remote_files):
+    files, tmp_path = remote_files
+    url = "https://test.url/B04.tif"
+    files[url] = create_raster_file(tmp_path / "RED.tif", same_crs=True)
+
+    # Diagonal corridor, a small part of its bounding box
+    corridor = {
+        "coordinates": [
+            [
+                [-78.60, 36.72],
+                [-78.58, 36.72],
+                [-78.34, 36.60],
+                [-78.36, 36.60],
+                [-78.60, 36.72],
+            ]
+        ],
+        "type": "Polygon",
+    }
+    budget = DownloadBudget(1)
+
+    ds = _granule2xrds(
+        roi=corridor,
+        token="test_token",
+        urls={"RED": url},
+        dt="2025-01-02T16:13:06.729Z",
+        sat_id="S30",
+        tile_id="T17SQA",
+        download_budget=budget,
+    )
+
+    with rasterio.open(files[url]) as dataset:
+        grid = _get_roi_grid(dataset, corridor)
+        bbox_bytes = _blocks_nbytes(dataset, [grid.window])
+        polygon_bytes = _blocks_nbytes(dataset, _intersecting_blocks(dataset, grid))
+
+    # Only the blocks intersecting the corridor are fetched
+    assert budget.bytes == polygon_bytes
+    assert polygon_bytes < 0.5 * bbox_bytes
+    red = ds["RED"].values[0]
+    assert (red[grid.outside_mask] == -9999).all()
+    assert (red[grid.mask] == 1).all()
+
+
+@patch("hlsxarr.process.stac2xrda.time.sleep")
+def test_fetch_stages(mock_sleep):
+    class StageHooks(ProcessHooks):
+        def __init__(self):
+            self.stages = []
+
+        def post_stage(self, stage, info):
+            self.stages.append((stage, info.get("attempt"), info.get("bytes")))
+
+    session = MagicMock()
+    response = MagicMock(content=b"data")
+    session.get.side_effect = [requests.ConnectionError("connection reset"), response]
+    hooks = StageHooks()
+    budget = DownloadBudget(1)
+
+    content = _fetch(
+        "https://test.url/B04.tif",
+        "test_token",
+        session=session,
+        download_budget=budget,
+        hooks=[hooks],
+        band="RED",
+    )
+
+    assert content == b"data"
+    # Waits for a slot and backoff are not part of the transfers
+    assert hooks.stages == [
+        ("queue", None, None),
+        ("fetch", 1, None),
+        ("retry", 1, None),
+        ("queue", None, None),
+        ("fetch", 2, 4),
+    ]
+    assert mock_sleep.call_count == 1
+    assert budget.files == 1 and budget.bytes == 4
+
+
+def test_read_window_boundless():
+    memfile = rasterio.io.MemoryFile()
+    with memfile.open(
+        driver="GTiff",
+        count=1,
+        dtype="int16",
+        width=10,
+        height=10,
+        crs=CRS.from_epsg(32617),
+        transform=from_origin(0, 300, 30, 30),
+    ) as dataset:
+        dataset.write(np.arange(100, dtype=np.int16).reshape(10, 10), 1)
+
+    # ROI of 6 x 6 pixels hanging 2 rows and 1 column over the top left corner
+    grid = _RoiGrid(
+        img_crs="EPSG:32617",
+        transform=tuple(from_origin(0, 300, 30, 30)),
+        pixel_width=30,
+        pixel_height=30,
+        width=6,
+        height=6,
+        window=Window(0, 0, 5, 4),
+        np_row_idx=2,
+        np_col_idx=1,
+        x_coords=np.arange(6),
+        y_coords=np.arange(6),
+        roi_crs="EPSG:32617",
+    )
+    out = np.zeros((1, 6, 6), dtype=np.int16)
+
+    with memfile.open() as dataset:
+        windows = _read_window(dataset, grid, out[0], -9999)
+
+    assert windows == [grid.window]
+    assert (out[0, :2] == -9999).all()
+    assert (out[0, :, 0] == -9999).all()
+    assert (out[0, 2:, 1:] == np.arange(100).reshape(10, 10)[:4, :5]).all()
+
+
+def test_read_window_polygon_blocks():
+    memfile = rasterio.io.MemoryFile()
+    with memfile.open(
+        driver="GTiff",
+        count=1,
+        dtype="int16",
+        width=64,
+        height=64,
+        crs=CRS.from_epsg(32617),
+        transform=from_origin(0, 1920, 30, 30),
+        tiled=True,
+        blockxsize=16,
+        blockysize=16,
+    ) as dataset:
+        dataset.write(np.ones((64, 64), dtype=np.int16), 1)
+
+    # L-shaped ROI covering the left column and the top row of 16 x 16 blocks
+    mask = np.zeros((64, 64), dtype=bool)
+    mask[:, :10] = True
+    mask[:10, :] = True
+    grid = _RoiGrid(
+        img_crs="EPSG:32617",
+        transform=tuple(from_origin(0, 1920, 30, 30)),
+        pixel_width=30,
+        pixel_height=30,
+        width=64,
+        height=64,
+        window=Window(0, 0, 64, 64),
+        np_row_idx=0,
+        np_col_idx=0,
+        x_coords=np.arange(64),
+        y_coords=np.arange(64),
+        roi_crs="EPSG:32617",
+        mask=mask,
+        outside_mask=~mask,
+    )
+    out = np.empty((64, 64), dtype=np.int16)
+
+    with memfile.open() as dataset:
+        windows = _read_window(dataset, grid, out, -9999)
+
+    # 4 blocks in the left column and 3 more in the top row out of 16
+    assert len(windows) == 7
+    assert (out[mask] == 1).all()
+    assert (out[~mask] == -9999).all()
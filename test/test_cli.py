@@ -0,0 +1,124 @@
+import json
+import pytest
+import numpy as np
+import pandas as pd
+import xarray as xr
+from unittest.mock import patch
+from hlsxarr.cli import _load_manifest, main
+
+
+@pytest.fixture
+def roi():
+    return {
+        "coordinates": [
+            [
+                [-78.60065306329707, 36.723116361254284],
+                [-78.60065306329707, 36.60070088520398],
+                [-78.33799755283125, 36.60070088520398],
+                [-78.33799755283125, 36.723116361254284],
+                [-78.60065306329707, 36.723116361254284],
+            ]
+        ],
+        "type": "Polygon",
+    }
+
+
+@pytest.fixture
+def manifest(tmp_path, roi):
+    path = tmp_path / "manifest.json"
+    path.write_text(
+        json.dumps(
+            {
+                "defaults": {
+                    "collections": ["HLSS30.v2.0"],
+                    "bands": ["RED"],
+                    "limit": 10,
+                },
+                "jobs": [
+                    {
+                        "name": "aoi-1",
+                        "roi": roi,
+                        "start_date": "2025-01-01",
+                        "end_date": "2025-01-07",
+                    },
+                    {
+                        "roi": {"type": "Feature", "geometry": roi, "properties": {}},
+                        "start_date": "2025-02-01",
+                        "end_date": "2025-02-07",
+                        "output": "february.nc",
+                    },
+                ],
+            }
+        )
+    )
+    return path
+
+
+def test_load_manifest(manifest, roi):
+    jobs = _load_manifest(manifest)
+
+    assert [job["name"] for job in jobs] == ["aoi-1", "job-1"]
+    assert jobs[1]["roi"] == roi
+    assert all(job["bands"] == ["RED"] for job in jobs)
+
+
+def test_load_manifest_missing_keys(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"jobs": [{"name": "aoi", "start_date": "2025"}]}))
+
+    with pytest.raises(ValueError, match="missing the keys"):
+        _load_manifest(path)
+
+
+@patch("hlsxarr.hls.HLSProcessor.process")
+def test_main(mock_process, manifest, tmp_path):
+    mock_process.return_value = xr.Dataset(
+        {"RED": (("time", "y", "x"), np.zeros((1, 2, 2), dtype=np.int16))},
+        coords={"time": [np.datetime64("2025-01-02")], "y": [1, 0], "x": [0, 1]},
+    )
+
+    exit_code = main(
+        [
+            str(manifest),
+            "--output-dir",
+            str(tmp_path / "out"),
+            "--jobs",
+            "2",
+            "--max-downloads",
+            "4",
+            "--edl-token",
+            "test_token",
+        ]
+    )
+
+    assert exit_code == 0
+    assert mock_process.call_count == 2
+    budgets = {id(call.kwargs["download_budget"]) for call in mock_process.call_args_list}
+    assert len(budgets) == 1, "Expected the download budget to be shared across jobs"
+    assert (tmp_path / "out" / "aoi-1.nc").exists()
+    assert (tmp_path / "out" / "february.nc").exists()
+
+
+@patch("hlsxarr.process.read._read", return_value=[])
+@patch("hlsxarr.hls.HLSProcessor._search")
+def test_main_unreadable_granules(mock_search, mock_read, manifest, tmp_path, capsys):
+    mock_search.return_value = pd.DataFrame(
+        [
+            {
+                "sat_id": "S30",
+                "tile_id": "T17SQA",
+                "date": "2025-01-02T16:13:06.729Z",
+                "stac_url": "https://test.url/RED.tif",
+                "band": "RED",
+            }
+        ]
+    )
+
+    exit_code = main(
+        [str(manifest), "--output-dir", str(tmp_path / "out"), "--edl-token", "test_token"]
+    )
+
+    # Granules found but not read, e.g. after a credential error, are failures
+    assert exit_code == 1
+    assert mock_read.call_count == 2
+    assert "0/2 jobs done" in capsys.readouterr().out
@@ -0,0 +1,70 @@
+import json
+import threading
+from hlsxarr.hooks import ChromeTracer, ProcessHooks, _stage
+
+
+class RecordingHooks(ProcessHooks):
+    def __init__(self):
+        self.calls = []
+
+    def pre_stage(self, stage, info):
+        self.calls.append(("pre", stage, dict(info)))
+
+    def post_stage(self, stage, info):
+        self.calls.append(("post", stage, dict(info)))
+
+
+def test_stage_calls_hooks():
+    hooks = RecordingHooks()
+
+    with _stage([hooks], "fetch", band="RED") as info:
+        info["bytes"] = 10
+
+    assert hooks.calls == [
+        ("pre", "fetch", {"band": "RED"}),
+        ("post", "fetch", {"band": "RED", "bytes": 10}),
+    ]
+
+
+def test_chrome_tracer(tmp_path):
+    tracer = ChromeTracer()
+    # Keep both threads alive together so that their ids are not reused
+    barrier = threading.Barrier(2)
+
+    def work():
+        barrier.wait()
+        with _stage([tracer], "fetch", band="RED"):
+            with _stage([tracer], "decode", band="RED"):
+                pass
+        barrier.wait()
+
+    threads = [threading.Thread(target=work, name=f"worker-{i}") for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    tracer.save(tmp_path / "trace.json")
+    with open(tmp_path / "trace.json") as f:
+        trace = json.load(f)
+
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    names = {
+        event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"
+    }
+    assert sorted(event["name"] for event in events) == [
+        "decode",
+        "decode",
+        "fetch",
+        "fetch",
+    ]
+    assert len({event["tid"] for event in events}) == 2
+    assert names == {"worker-0", "worker-1"}
+    # decode is nested in fetch on each thread
+    for tid in {event["tid"] for event in events}:
+        fetch, decode = sorted(
+            (event for event in events if event["tid"] == tid),
+            key=lambda event: event["name"] != "fetch",
+        )
+        assert fetch["ts"] <= decode["ts"]
+        assert decode["ts"] + decode["dur"] <= fetch["ts"] + fetch["dur"]
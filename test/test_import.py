@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "xarray",
+    "pandas",
+    "rasterio",
+    "pyproj",
+    "shapely",
+    "scipy",
+    "pystac_client",
+    "requests",
+]
+
+
+def test_import_is_lazy():
+    # Run in a fresh interpreter since other tests already imported the dependencies
+    code = (
+        "import sys\n"
+        "import hlsxarr\n"
+        "from hlsxarr import HLSProcessor\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+
+    assert output.strip() == ""
+
+
+def test_lazy_attributes():
+    import hlsxarr
+    from hlsxarr.hls import HLSProcessor
+    from hlsxarr.roi import RoiPolygon
+
+    assert hlsxarr.HLSProcessor is HLSProcessor
+    assert hlsxarr.RoiPolygon is RoiPolygon
+    assert set(hlsxarr.__all__) <= set(dir(hlsxarr))
@@ -0,0 +1,99 @@
+import threading
+import pytest
+from pyproj import Transformer
+from shapely.geometry import Point
+from hlsxarr.roi import RoiPolygon
+from hlsxarr.utils import (
+    _get_projected_bounds,
+    _get_projected_polygon,
+    _get_roi_mask,
+    _get_roi_outside_mask,
+    _get_roi_xr_utm_cordts,
+    _get_transformer,
+)
+
+
+@pytest.fixture
+def roi():
+    # ROI CRS (UTM Zone 17N, EPSG:32617)
+    return {
+        "coordinates": [
+            [
+                [-78.60065306329707, 36.723116361254284],
+                [-78.60065306329707, 36.60070088520398],
+                [-78.33799755283125, 36.60070088520398],
+                [-78.33799755283125, 36.723116361254284],
+                [-78.60065306329707, 36.723116361254284],
+            ]
+        ],
+        "type": "Polygon",
+    }
+
+
+def test_projected_bounds(roi):
+    transformer = Transformer.from_crs("EPSG:4326", "EPSG:32617", always_xy=True)
+    xs, ys = zip(*[transformer.transform(x, y) for x, y in roi["coordinates"][0]])
+
+    assert _get_projected_bounds(roi, "EPSG:32617") == pytest.approx(
+        (min(xs), min(ys), max(xs), max(ys))
+    )
+
+
+def test_transformer_cached_per_thread():
+    transformer = _get_transformer("EPSG:4326", "EPSG:32617")
+    assert _get_transformer("EPSG:4326", "EPSG:32617") is transformer
+
+    other = []
+    thread = threading.Thread(
+        target=lambda: other.append(_get_transformer("EPSG:4326", "EPSG:32617"))
+    )
+    thread.start()
+    thread.join()
+    assert other[0] is not transformer
+
+
+def test_roi_xr_utm_cordts_cached(roi):
+    x_coords, y_coords = _get_roi_xr_utm_cordts(roi, "EPSG:32617", 30, 30)
+    cached_x, cached_y = _get_roi_xr_utm_cordts(dict(roi), "EPSG:32617", 30, 30)
+
+    assert cached_x is x_coords and cached_y is y_coords
+    assert not x_coords.flags.writeable
+    assert (x_coords[1:] - x_coords[:-1] == 30).all()
+    assert (y_coords[:-1] - y_coords[1:] == 30).all()
+
+
+def test_roi_mask_and_area():
+    # L-shaped ROI
+    roi = {
+        "coordinates": [
+            [
+                [-78.6, 36.7],
+                [-78.6, 36.6],
+                [-78.3, 36.6],
+                [-78.3, 36.62],
+                [-78.58, 36.62],
+                [-78.58, 36.7],
+                [-78.6, 36.7],
+            ]
+        ],
+        "type": "Polygon",
+    }
+    x_coords, y_coords = _get_roi_xr_utm_cordts(roi, "EPSG:32617", 30, 30)
+    mask = _get_roi_mask(roi, "EPSG:32617", 30, 30)
+
+    assert mask.shape == (len(y_coords), len(x_coords))
+    assert not mask.flags.writeable
+    outside = _get_roi_outside_mask(roi, "EPSG:32617", 30, 30)
+    assert outside is _get_roi_outside_mask(dict(roi), "EPSG:32617", 30, 30)
+    assert not outside.flags.writeable
+    assert (outside == ~mask).all()
+    # Pixel centers inside the projected polygon
+    polygon = _get_projected_polygon(roi, "EPSG:32617")
+    for row, col in [(5, 5), (5, -5), (-40, 5), (-40, -5), (100, 400)]:
+        assert mask[row, col] == polygon.contains(Point(x_coords[col], y_coords[row]))
+    assert 0.1 < mask.mean() < 0.4
+
+    minx, miny, maxx, maxy = _get_projected_bounds(roi, "EPSG:32617")
+    bbox_area = (maxx - minx) * (maxy - miny) / 1e6
+    area = RoiPolygon(geometry=roi).area
+    assert area == pytest.approx(bbox_area * mask.mean(), rel=0.05)